@@ -5,6 +5,7 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 
 from models.employee import Employee
+from services.rescoring import mark_dirty
 
 class EmployeeCreateRequest(BaseModel):
     employee_id: str
@@ -32,7 +33,7 @@ async def bulk_create_employees(
         raise HTTPException(403, "Invalid API key")
     
     created = 0
-    updated = 0
+    updated_ids = []
     
     for emp_data in employees:
         existing = db.query(Employee).filter_by(
@@ -43,17 +44,18 @@ async def bulk_create_employees(
             # Update
             for field, value in emp_data.dict().items():
                 setattr(existing, field, value)
-            updated += 1
+            updated_ids.append(existing.employee_id)
         else:
             # Create
             employee = Employee(**emp_data.dict())
             db.add(employee)
             created += 1
     
+    mark_dirty(db, updated_ids)
     db.commit()
     
     return {
         "created": created,
-        "updated": updated,
+        "updated": len(updated_ids),
         "total": len(employees)
     }
\ No newline at end of file
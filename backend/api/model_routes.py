@@ -0,0 +1,67 @@
+from fastapi import APIRouter, Depends, HTTPException
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+import logging
+
+from models.user import User
+from auth.auth_handler import get_current_admin
+from services.predictor_service import PredictorService, get_predictor_service
+
+logger = logging.getLogger(__name__)
+
+model_router = APIRouter()
+
+@model_router.get("/models")
+async def list_models(
+    predictor_service: PredictorService = Depends(get_predictor_service),
+    current_user: User = Depends(get_current_admin)
+):
+    """List registered model versions and the one this worker is serving"""
+    registry = predictor_service.predictor.registry
+    versions = await run_in_threadpool(registry.list_versions)
+    return {
+        "serving_version": predictor_service.model_version,
+        "versions": versions
+    }
+
+@model_router.get("/models/cache")
+async def prediction_cache_stats(
+    predictor_service: PredictorService = Depends(get_predictor_service),
+    current_user: User = Depends(get_current_admin)
+):
+    """Hit/miss counters and size of the prediction cache"""
+    return predictor_service.cache.stats()
+
+@model_router.get("/models/batcher")
+async def micro_batcher_stats(
+    predictor_service: PredictorService = Depends(get_predictor_service),
+    current_user: User = Depends(get_current_admin)
+):
+    """Batch-size, queue-wait and batch-latency histograms for interactive predictions"""
+    if predictor_service.batcher is None:
+        return {"enabled": False}
+    return {"enabled": True, **predictor_service.batcher.stats()}
+
+@model_router.post("/models/reload")
+async def reload_model(
+    version: Optional[str] = None,
+    predictor_service: PredictorService = Depends(get_predictor_service),
+    current_user: User = Depends(get_current_admin)
+):
+    """Activate a model version (the registry's active one by default) and hot-swap it in"""
+    registry = predictor_service.predictor.registry
+    try:
+        if version and version not in registry.read_manifest().get('versions', {}):
+            raise KeyError(f"Unknown model version: {version}")
+        result = await predictor_service.reload(version)
+        # Activate only once this worker has loaded and warmed the version,
+        # so other workers' watchers never pick up an artifact that fails
+        if version:
+            await run_in_threadpool(registry.activate, version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=e.args[0])
+    except Exception as e:
+        logger.error(f"Model reload failed: {e}")
+        raise HTTPException(status_code=500, detail=f"Model reload failed: {e}")
+
+    return {"message": "Model reloaded", **result}
@@ -1,11 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 import random
 
 from models.employee import Employee
 from models.prediction import Prediction
+from services.explainer import drivers_to_importance
+from services.feature_store import FeatureStore
+from services.predictor_service import PredictorService, get_predictor_service, build_scoring_payload
+from services.rescoring import IncrementalRescorer
 from config import settings
 
 router = APIRouter()
@@ -99,6 +104,11 @@ async def get_employee_details(
         if not employee:
             raise HTTPException(status_code=404, detail="Employee not found")
         
+        # Drivers were stored when the prediction ran, so viewing never recomputes them
+        latest = db.query(Prediction).filter_by(employee_id=employee_id).order_by(
+            Prediction.prediction_date.desc(), Prediction.id.desc()
+        ).first()
+        
         return {
             "employee": {
                 "id": employee.employee_id,
@@ -114,7 +124,15 @@ async def get_employee_details(
                 "factors": employee.risk_factors,
                 "last_updated": employee.last_prediction_date.isoformat() if employee.last_prediction_date else None
             },
-            "latest_prediction": None,
+            "latest_prediction": {
+                "risk_score": latest.risk_score,
+                "confidence": latest.confidence_score,
+                "risk_factors": latest.risk_factors,
+                "recommendations": latest.recommendations,
+                "drivers": latest.feature_importance or {},
+                "model_version": latest.model_version,
+                "prediction_date": latest.prediction_date.isoformat() if latest.prediction_date else None
+            } if latest else None,
             "history": []
         }
     except HTTPException:
@@ -141,20 +159,117 @@ async def get_retention_trends(days: int = 30):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/employees/{employee_id}/predict")
-async def run_prediction(employee_id: str, db: Session = Depends(get_db)):
+async def run_prediction(
+    employee_id: str,
+    db: Session = Depends(get_db),
+    predictor_service: PredictorService = Depends(get_predictor_service)
+):
     """Run retention prediction for a specific employee"""
     try:
         employee = db.query(Employee).filter_by(employee_id=employee_id).first()
         if not employee:
             raise HTTPException(status_code=404, detail="Employee not found")
         
-        # For demo, just update with random values
-        employee.current_risk_score = random.uniform(0.1, 0.95)
+        # Integration metrics drive both the model and the risk-factor rules
+        from services.data_collector import DataCollector  # Imported on first use; keeps API startup light
+        employee_data = await run_in_threadpool(build_scoring_payload, employee, DataCollector(db))
+        risk_score, details = await predictor_service.predict(employee_data)
+        risk_score = float(risk_score)
+        risk_factors = list(details['risk_factors'].keys())
+        
+        employee.current_risk_score = risk_score
+        employee.risk_factors = risk_factors
         employee.last_prediction_date = datetime.now()
+        
+        db.add(Prediction(
+            employee_id=employee_id,
+            risk_score=risk_score,
+            confidence_score=float(details['confidence']),
+            prediction_horizon_days=settings.WARNING_PERIOD_DAYS,
+            risk_factors=risk_factors,
+            recommendations=details['suggested_interventions'],
+            model_version=details['model_version'],
+            feature_importance=drivers_to_importance(details['drivers']),
+            feature_vector=predictor_service.predictor.feature_extractor.extract_features(employee_data).tolist()
+        ))
+        db.commit()
+        
+        return {
+            "message": "Prediction completed",
+            "employee_id": employee_id,
+            "risk_score": risk_score,
+            "risk_level": details['risk_level'],
+            "confidence": float(details['confidence']),
+            "risk_factors": details['risk_factors'],
+            "departure_window": details['departure_window'],
+            "suggested_interventions": details['suggested_interventions'],
+            "drivers": details['drivers'],
+            "model_version": details['model_version']
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/employees/{employee_id}/outcome")
+async def record_outcome(
+    employee_id: str,
+    outcome: str,
+    outcome_date: Optional[datetime] = None,
+    db: Session = Depends(get_db)
+):
+    """Label an employee's earlier predictions with what actually happened (stayed, left, ...)"""
+    try:
+        employee = db.query(Employee).filter_by(employee_id=employee_id).first()
+        if not employee:
+            raise HTTPException(status_code=404, detail="Employee not found")
+        
+        outcome_date = outcome_date or datetime.now()
+        candidates = db.query(
+            Prediction.id, Prediction.prediction_date, Prediction.prediction_horizon_days
+        ).filter(
+            Prediction.employee_id == employee_id,
+            Prediction.actual_outcome.is_(None),
+            Prediction.prediction_date <= outcome_date
+        ).all()
+        # Only predictions whose horizon reaches the outcome were predicting it
+        prediction_ids = [
+            prediction_id for prediction_id, prediction_date, horizon_days in candidates
+            if prediction_date + timedelta(days=horizon_days or settings.WARNING_PERIOD_DAYS) >= outcome_date
+        ]
+        labeled = 0
+        if prediction_ids:
+            labeled = db.query(Prediction).filter(Prediction.id.in_(prediction_ids)).update({
+                Prediction.actual_outcome: outcome.lower(),
+                Prediction.outcome_date: outcome_date
+            }, synchronize_session=False)
         db.commit()
         
-        return {"message": "Prediction completed", "employee_id": employee_id}
+        return {"employee_id": employee_id, "outcome": outcome.lower(), "predictions_labeled": labeled}
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/predictions/batch")
+async def run_batch_prediction(
+    force: bool = False,
+    company_id: Optional[str] = None,
+    db: Session = Depends(get_db),
+    predictor_service: PredictorService = Depends(get_predictor_service)
+):
+    """Rescore employees whose inputs changed since their last prediction"""
+    try:
+        # Bulk rescoring with the rule-based fallback would be redone as soon as the model loads
+        if predictor_service.status in ('not_loaded', 'loading'):
+            raise HTTPException(status_code=503, detail="Model is still loading; retry once /ready reports ready")
+        
+        from services.data_collector import DataCollector
+        
+        rescorer = IncrementalRescorer(db, predictor_service.predictor, DataCollector(db), FeatureStore())
+        summary = await run_in_threadpool(rescorer.run, company_id, force)
+        return {"message": "Batch prediction completed", **summary}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
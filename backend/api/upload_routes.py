@@ -1,11 +1,12 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
 from sqlalchemy.orm import Session
-import pandas as pd
 import io
 from typing import List
 from datetime import datetime
 
 from models.employee import Employee
+from services.predictor_service import PredictorService, get_predictor_service
+from services.rescoring import mark_dirty
 from config import settings
 
 upload_router = APIRouter()
@@ -21,7 +22,8 @@ def get_db():
 @upload_router.post("/upload/employees")
 async def upload_employees(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    predictor_service: PredictorService = Depends(get_predictor_service)
 ):
     """Upload employee data from CSV/Excel file"""
     try:
@@ -29,6 +31,8 @@ async def upload_employees(
         if not file.filename.endswith(('.csv', '.xlsx', '.xls')):
             raise HTTPException(400, "File must be CSV or Excel format")
         
+        import pandas as pd
+        
         # Read file content
         contents = await file.read()
         
@@ -53,6 +57,7 @@ async def upload_employees(
         success_count = 0
         error_count = 0
         errors = []
+        updated_ids = []
         
         for index, row in df.iterrows():
             try:
@@ -68,6 +73,8 @@ async def upload_employees(
                             setattr(existing, col, pd.to_datetime(row[col]))
                         else:
                             setattr(existing, col, row[col])
+                    updated_ids.append(existing.employee_id)
+                    predictor_service.invalidate_employee(existing.employee_id)
                 else:
                     # Create new employee
                     employee = Employee(
@@ -91,6 +98,7 @@ async def upload_employees(
                 error_count += 1
                 errors.append(f"Row {index + 2}: {str(e)}")
         
+        mark_dirty(db, updated_ids)
         db.commit()
         
         return {
@@ -119,6 +127,8 @@ async def download_template():
         'calendar_id': ['john.doe@company.com', 'jane.smith@company.com', 'bob.wilson@company.com']
     }
     
+    import pandas as pd
+    
     df = pd.DataFrame(template_data)
     
     # Convert to CSV
@@ -2,12 +2,16 @@ from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+from starlette.concurrency import run_in_threadpool
 import uvicorn
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, Session
 import logging
 from datetime import datetime, timedelta
+import asyncio
 import random
+import sys
+import time
 
 from config import settings
 from models import Base
@@ -18,7 +22,8 @@ from models.prediction import Prediction
 from api.routes import router
 from api.auth_routes import auth_router
 from api.upload_routes import upload_router
-from services.ml_predictor import MLPredictor
+from api.model_routes import model_router
+from services.predictor_service import PredictorService
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -35,23 +40,48 @@ else:
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Create tables
-Base.metadata.create_all(bind=engine)
+def init_db():
+    """Create any missing tables; run once per deploy (python app.py --init-db) or at startup"""
+    Base.metadata.create_all(bind=engine)
+
+async def run_startup_task(app: FastAPI, name: str, func):
+    """Run a blocking startup step in the threadpool, recording its state for /ready"""
+    task_state = {'status': 'running', 'elapsed_seconds': None, 'error': None}
+    app.state.startup_tasks[name] = task_state
+    started = time.monotonic()
+    try:
+        await run_in_threadpool(func)
+        task_state['status'] = 'done'
+    except Exception as e:
+        logger.error(f"Startup task {name} failed: {e}")
+        task_state['status'] = 'failed'
+        task_state['error'] = str(e)
+    finally:
+        task_state['elapsed_seconds'] = time.monotonic() - started
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting AI Retention Predictor")
-    # Initialize ML model
-    predictor = MLPredictor()
-    predictor.load_model()
+    app.state.startup_tasks = {}
+    if settings.AUTO_CREATE_SCHEMA:
+        await run_in_threadpool(init_db)
     
-    # Create some demo data
-    create_demo_data()
+    # Load (or train) the model in the background; predictions are rule-based until it is ready
+    predictor_service = PredictorService()
+    app.state.predictor_service = predictor_service
+    predictor_service.start_loading()
+    
+    # Seed demo data in the background too, so health checks and other routes are served immediately
+    background_tasks = [asyncio.create_task(run_startup_task(app, "demo_data", create_demo_data))]
     
     yield
     # Shutdown
     logger.info("Shutting down AI Retention Predictor")
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await predictor_service.shutdown()
 
 app = FastAPI(
     title=settings.APP_NAME,
@@ -80,12 +110,30 @@ def get_db():
 app.include_router(auth_router, prefix="/api/auth", tags=["authentication"])
 app.include_router(router, prefix="/api/v1", tags=["api"])
 app.include_router(upload_router, prefix="/api/v1", tags=["upload"])
+app.include_router(model_router, prefix="/api/v1/admin", tags=["models"])
 
 # Health check
 @app.get("/health")
 async def health_check():
     return {"status": "healthy", "version": settings.APP_VERSION}
 
+# Readiness: 503 with per-task progress until the model and startup tasks have finished
+@app.get("/ready")
+async def readiness_check():
+    predictor_service = getattr(app.state, "predictor_service", None)
+    startup_tasks = getattr(app.state, "startup_tasks", {})
+    model = predictor_service.progress() if predictor_service else {"status": "not_loaded"}
+    ready = (
+        model["status"] in ("ready", "failed")
+        and all(task["status"] != "running" for task in startup_tasks.values())
+    )
+    body = {
+        "status": "ready" if ready else "starting",
+        "model": model,
+        "tasks": startup_tasks
+    }
+    return JSONResponse(body, status_code=200 if ready else 503)
+
 def create_demo_data():
     """Create demo company and users for testing"""
     from auth.auth_handler import auth_handler
@@ -150,11 +198,12 @@ def create_demo_data():
             departments = ['Engineering', 'Marketing', 'Sales', 'HR', 'Product']
             positions = ['Junior', 'Senior', 'Lead', 'Manager', 'Director']
             
+            employees = []
             for i in range(50):
                 department = random.choice(departments)
                 position = random.choice(positions)
                 
-                employee = Employee(
+                employees.append(dict(
                     employee_id=f"EMP{str(i+1).zfill(5)}",
                     email=f"employee{i+1}@demo.com",
                     name=f"Employee {i+1}",
@@ -169,12 +218,12 @@ def create_demo_data():
                     is_active=True,
                     current_risk_score=random.uniform(0.1, 0.95),
                     risk_factors=["Low engagement", "High workload", "Market competitiveness"][:random.randint(0, 3)]
-                )
-                db.add(employee)
+                ))
             
             # Create a few predictions for demo
+            predictions = []
             for i in range(10):
-                prediction = Prediction(
+                predictions.append(dict(
                     employee_id=f"EMP{str(random.randint(1, 50)).zfill(5)}",
                     prediction_date=datetime.now() - timedelta(days=random.randint(1, 30)),
                     risk_score=random.uniform(0.1, 0.95),
@@ -182,9 +231,11 @@ def create_demo_data():
                     prediction_horizon_days=90,
                     risk_factors=["Low engagement", "High workload", "Market competitiveness"][:random.randint(1, 3)],
                     model_version="v1.0"
-                )
-                db.add(prediction)
+                ))
             
+            # One executemany per table instead of a flush per row
+            db.bulk_insert_mappings(Employee, employees)
+            db.bulk_insert_mappings(Prediction, predictions)
             db.commit()
             logger.info("Demo employees created successfully")
             
@@ -195,4 +246,8 @@ def create_demo_data():
         db.close()
 
 if __name__ == "__main__":
-    uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    if "--init-db" in sys.argv:
+        init_db()
+        logger.info("Database schema created")
+    else:
+        uvicorn.run("app:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
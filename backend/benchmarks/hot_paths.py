@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""
+Benchmark the prediction and feature-extraction hot paths
+
+Times FeatureExtractor.extract_features, MLPredictor.predict,
+MLPredictor.batch_predict, MLPredictor._rule_based_prediction and model load
+over seeded synthetic payloads (1k, 100k and 1M employees), reporting
+rows/sec, p50/p99 per-row latency and peak RSS. Each case runs in a fresh
+process so its peak RSS is its own. Results are written as JSON; pass an
+earlier file with --compare to flag regressions. Run from the backend directory:
+
+    python -m benchmarks.hot_paths [--sizes 1k 100k 1m] [--compare results/old.json]
+
+Model load uses the active registry version (see MODEL_REGISTRY_DIR); with an
+empty registry MLPredictor trains and publishes a demo model first.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import warnings
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+SIZES = {'1k': 1_000, '100k': 100_000, '1m': 1_000_000}
+PER_ROW_BENCHMARKS = ['extract_features', 'predict', 'rule_based_prediction']
+BENCHMARKS = PER_ROW_BENCHMARKS + ['batch_predict', 'model_load']
+WARMUP_ROWS = 100
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024  # bytes on macOS, KiB on Linux
+
+def summarize(latencies_s: np.ndarray, rows: int, seconds: float) -> Dict:
+    latencies_us = latencies_s * 1e6
+    return {
+        'rows': rows,
+        'seconds': seconds,
+        'rows_per_sec': rows / seconds if seconds else None,
+        'p50_us': float(np.percentile(latencies_us, 50)),
+        'p99_us': float(np.percentile(latencies_us, 99))
+    }
+
+def run_case(benchmark: str, n_rows: int, options: Dict) -> Dict:
+    """Run one benchmark in the current process (called in a fresh worker)"""
+    logging.basicConfig(level=logging.WARNING)
+    warnings.filterwarnings('ignore')
+
+    from benchmarks.payloads import generate_payloads, iter_payload_chunks
+    from services.ml_predictor import MLPredictor
+
+    if benchmark == 'model_load':
+        timings = []
+        for _ in range(options['load_repeats']):
+            start = time.perf_counter()
+            predictor = MLPredictor()
+            predictor.load_model()
+            timings.append(time.perf_counter() - start)
+        timings = np.array(timings)
+        # The first load also pays for importing xgboost/sklearn/onnxruntime
+        return {
+            'rows': None,
+            'seconds': float(timings.sum()),
+            'rows_per_sec': None,
+            'first_load_s': float(timings[0]),
+            'p50_us': float(np.percentile(timings, 50) * 1e6),
+            'p99_us': float(np.percentile(timings, 99) * 1e6),
+            'model_version': predictor.model_version,
+            'peak_rss_mb': peak_rss_mb()
+        }
+
+    predictor = MLPredictor()
+    predictor.load_model()
+    rows_to_time = n_rows
+    if benchmark in PER_ROW_BENCHMARKS:
+        # Per-row paths are timed call by call on at most per_row_limit rows
+        rows_to_time = min(n_rows, options['per_row_limit'])
+        call = {
+            'extract_features': predictor.feature_extractor.extract_features,
+            'predict': predictor.predict,
+            'rule_based_prediction': predictor._rule_based_prediction
+        }[benchmark]
+    else:
+        batch_rows = options['batch_rows']
+        call = predictor.batch_predict
+
+    # Untimed warm-up on different rows, so first-call costs don't skew small runs
+    warm_up = generate_payloads(WARMUP_ROWS, seed=options['seed'] + 1)
+    if benchmark in PER_ROW_BENCHMARKS:
+        for payload in warm_up:
+            call(payload)
+    else:
+        call(warm_up)
+
+    latencies = []
+    seconds = 0.0
+    for chunk in iter_payload_chunks(rows_to_time, options['chunk_size'], options['seed']):
+        if benchmark in PER_ROW_BENCHMARKS:
+            for payload in chunk:
+                start = time.perf_counter()
+                call(payload)
+                elapsed = time.perf_counter() - start
+                latencies.append(elapsed)
+                seconds += elapsed
+        else:
+            # Per-row latency of a batch call is its duration over its rows
+            for begin in range(0, len(chunk), batch_rows):
+                batch = chunk[begin:begin + batch_rows]
+                start = time.perf_counter()
+                call(batch)
+                elapsed = time.perf_counter() - start
+                latencies.append(elapsed / len(batch))
+                seconds += elapsed
+        del chunk
+
+    result = summarize(np.array(latencies), rows_to_time, seconds)
+    result['model_version'] = predictor.model_version
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+def run_isolated(benchmark: str, n_rows: int, options: Dict) -> Dict:
+    """Run a case in a fresh spawned process so peak RSS and imports are its own"""
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(1) as pool:
+        return pool.apply(run_case, (benchmark, n_rows, options))
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+def environment() -> Dict:
+    from config import settings
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'inference_backend': settings.INFERENCE_BACKEND,
+        'explanations_enabled': settings.EXPLANATIONS_ENABLED
+    }
+
+def compare(results: List[Dict], baseline_path: str, tolerance: float) -> List[str]:
+    """Print current vs baseline and return the cases slower by more than tolerance"""
+    with open(baseline_path) as f:
+        baseline = {(r['benchmark'], r['size']): r for r in json.load(f)['results']}
+
+    regressions = []
+    print(f"\nCompared with {baseline_path}:")
+    print(f"{'benchmark':>22} | {'size':>5} | {'baseline':>12} | {'current':>12} | change")
+    print("-" * 72)
+    for result in results:
+        previous = baseline.get((result['benchmark'], result['size']))
+        if previous is None:
+            continue
+        # Throughput for row benchmarks, median load time for model_load (lower is better)
+        if result['rows_per_sec'] is not None and previous.get('rows_per_sec'):
+            before, after, unit = previous['rows_per_sec'], result['rows_per_sec'], 'rows/s'
+            change = after / before - 1
+        else:
+            before, after, unit = previous['p50_us'] / 1e3, result['p50_us'] / 1e3, 'ms'
+            change = before / after - 1
+        flag = ''
+        if change < -tolerance:
+            flag = '  REGRESSION'
+            regressions.append(f"{result['benchmark']}/{result['size']}")
+        print(f"{result['benchmark']:>22} | {result['size']:>5} | {before:>12,.1f} | {after:>12,.1f} | "
+              f"{change:+.1%} {unit}{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=list(SIZES))
+    parser.add_argument('--benchmarks', nargs='+', choices=BENCHMARKS, default=BENCHMARKS)
+    parser.add_argument('--per-row-limit', type=int, default=100_000,
+                        help='Rows timed call-by-call for per-row benchmarks')
+    parser.add_argument('--batch-rows', type=int, default=4096, help='Rows per batch_predict call')
+    parser.add_argument('--chunk-size', type=int, default=100_000, help='Payloads generated at a time')
+    parser.add_argument('--load-repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='JSON results path (default: benchmarks/results/<commit>-<time>.json)')
+    parser.add_argument('--compare', help='Earlier results JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='Allowed slowdown before a case counts as a regression')
+    args = parser.parse_args()
+
+    options = {
+        'per_row_limit': args.per_row_limit,
+        'batch_rows': args.batch_rows,
+        'chunk_size': args.chunk_size,
+        'load_repeats': args.load_repeats,
+        'seed': args.seed
+    }
+    report = {'environment': environment(), 'options': options, 'results': []}
+
+    print(f"{'benchmark':>22} | {'size':>5} | {'rows/sec':>12} | {'p50 us':>10} | {'p99 us':>10} | peak RSS MB")
+    print("-" * 86)
+    for benchmark in args.benchmarks:
+        # Model load does not depend on the payload count
+        sizes = args.sizes[:1] if benchmark == 'model_load' else args.sizes
+        for size in sizes:
+            result = {'benchmark': benchmark, 'size': size if benchmark != 'model_load' else '-',
+                      **run_isolated(benchmark, SIZES[size], options)}
+            report['results'].append(result)
+            rows_per_sec = f"{result['rows_per_sec']:>12,.0f}" if result['rows_per_sec'] else f"{'-':>12}"
+            print(f"{benchmark:>22} | {result['size']:>5} | {rows_per_sec} | {result['p50_us']:>10,.1f} | "
+                  f"{result['p99_us']:>10,.1f} | {result['peak_rss_mb']:,.0f}")
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{report['environment']['commit'] or 'nocommit'}-{datetime.now():%Y%m%d-%H%M%S}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        regressions = compare(report['results'], args.compare, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Benchmark the native Booster inference engine against the sklearn path
+
+Compares StandardScaler.transform + XGBClassifier.predict_proba with
+BoosterInferenceEngine.predict_proba at batch sizes 1, 64 and 10k, reporting
+per-row latency and rows/sec, then checks the two paths agree exactly, both
+on the loaded model and on a model trained on discrete-valued features
+(where split cut points equal input values, so any rounding difference in
+scaling flips splits). Run from the backend directory:
+
+    python -m benchmarks.inference_engine [--repeats 200]
+"""
+
+import argparse
+import logging
+import time
+import warnings
+
+import numpy as np
+
+from services.feature_extractor import FEATURE_NAMES
+from services.ml_predictor import MLPredictor
+from services.inference_engine import BoosterInferenceEngine
+
+BATCH_SIZES = [1, 64, 10_000]
+
+def discrete_parity(n_rows: int = 20_000, seed: int = 0) -> float:
+    """Max probability difference on a model trained and scored on discrete-valued rows"""
+    import xgboost as xgb
+    from sklearn.preprocessing import StandardScaler
+
+    rng = np.random.default_rng(seed)
+    # Codes, levels and counts, like the department, position and count features
+    steps = [(8, 0.1), (4, 0.3), (50, 0.01), (200, 1.0), (30, 0.1)]
+    features = np.column_stack([rng.integers(0, levels, n_rows) * step
+                                for levels, step in (steps * 7)[:len(FEATURE_NAMES)]])
+    logits = 3 * features[:, 0] - 2 * features[:, 1] + features[:, 3] / 100 - 1
+    labels = (rng.random(n_rows) < 1 / (1 + np.exp(-logits))).astype(int)
+    scaler = StandardScaler().fit(features)
+    model = xgb.XGBClassifier(n_estimators=200, max_depth=6).fit(scaler.transform(features), labels)
+
+    expected = model.predict_proba(scaler.transform(features))[:, 1]
+    return float(np.max(np.abs(expected - BoosterInferenceEngine(model, scaler).predict_proba(features))))
+
+def time_path(predict, features: np.ndarray, repeats: int) -> float:
+    """Median seconds per call"""
+    predict(features)  # warm up
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(features)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=200, help='Timed calls per batch size')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    warnings.filterwarnings('ignore')
+
+    predictor = MLPredictor()
+    predictor.load_model()
+    if not BoosterInferenceEngine.supports(predictor.model, predictor.scaler):
+        raise SystemExit("Loaded model is not an XGBClassifier + StandardScaler pair")
+
+    engine = BoosterInferenceEngine(predictor.model, predictor.scaler)
+    sklearn_path = lambda X: predictor.model.predict_proba(predictor.scaler.transform(X))[:, 1]
+
+    rng = np.random.default_rng(42)
+    n_features = engine.n_features
+    all_features = predictor.scaler.mean_ + predictor.scaler.scale_ * rng.standard_normal((max(BATCH_SIZES), n_features))
+
+    print(f"Model version: {predictor.model_version}")
+    print(f"{'batch':>7} | {'path':>8} | {'us/row':>10} | {'rows/sec':>12} | speedup")
+    print("-" * 60)
+    for batch_size in BATCH_SIZES:
+        features = all_features[:batch_size]
+        repeats = max(3, args.repeats // max(1, batch_size // 64))
+        baseline = time_path(sklearn_path, features, repeats)
+        native = time_path(engine.predict_proba, features, repeats)
+        for name, seconds in (('sklearn', baseline), ('booster', native)):
+            print(f"{batch_size:>7} | {name:>8} | {seconds / batch_size * 1e6:>10.2f} | "
+                  f"{batch_size / seconds:>12,.0f} | {baseline / seconds:.1f}x")
+
+    max_diff = np.max(np.abs(sklearn_path(all_features) - engine.predict_proba(all_features)))
+    print(f"\nMax |probability difference| over {len(all_features)} rows: {max_diff:.2e}")
+    discrete_diff = discrete_parity()
+    print(f"Max |probability difference| on a discrete-feature model: {discrete_diff:.2e}")
+    if max_diff > 0 or discrete_diff > 0:
+        raise SystemExit("BoosterInferenceEngine does not match the sklearn path")
+
+if __name__ == "__main__":
+    main()
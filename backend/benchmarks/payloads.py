@@ -0,0 +1,84 @@
+"""
+Seeded synthetic employee payloads for benchmarks
+
+Payloads have the same shape as DataCollector.collect_employee_data output
+(basic_info plus the four *_metrics sections). Values are drawn column-wise
+with numpy one chunk at a time, so a million-row run never holds more than
+chunk_size payload dicts in memory.
+"""
+
+from typing import Dict, Iterator, List
+
+import numpy as np
+
+DEPARTMENTS = ['Engineering', 'Product', 'Sales', 'Marketing', 'HR', 'Finance', 'Operations', 'Support']
+POSITIONS = ['Junior Engineer', 'Engineer', 'Senior Engineer', 'Team Lead', 'Manager', 'Director', 'Analyst']
+TRENDS = ['declining', 'stable', 'improving']
+
+# (section, field, kind, low, high); kind is 'int', 'float' or 'trend'
+PAYLOAD_FIELDS = [
+    ('slack_metrics', 'message_count', 'int', 0, 300),
+    ('slack_metrics', 'avg_response_time', 'float', 0, 120),
+    ('slack_metrics', 'active_channels', 'int', 0, 20),
+    ('slack_metrics', 'sentiment_score', 'float', -1, 1),
+    ('slack_metrics', 'after_hours_messages', 'int', 0, 60),
+    ('slack_metrics', 'participation_trend', 'trend', 0, 0),
+    ('email_metrics', 'sent_count', 'int', 0, 300),
+    ('email_metrics', 'received_count', 'int', 0, 300),
+    ('email_metrics', 'avg_response_time', 'float', 0, 48),
+    ('email_metrics', 'unread_percentage', 'float', 0, 100),
+    ('email_metrics', 'after_hours_emails', 'int', 0, 60),
+    ('email_metrics', 'email_sentiment', 'float', -1, 1),
+    ('email_metrics', 'external_communication', 'int', 0, 100),
+    ('calendar_metrics', 'meeting_hours', 'float', 0, 40),
+    ('calendar_metrics', 'meetings_declined', 'int', 0, 60),
+    ('calendar_metrics', 'one_on_ones', 'int', 0, 8),
+    ('calendar_metrics', 'recurring_meetings_dropped', 'int', 0, 3),
+    ('calendar_metrics', 'meeting_participation', 'float', 0, 1),
+    ('calendar_metrics', 'calendar_fragmentation', 'float', 0, 1),
+    ('calendar_metrics', 'pto_days', 'int', 0, 25),
+    ('productivity_metrics', 'task_completion_rate', 'float', 0, 1),
+    ('productivity_metrics', 'project_involvement', 'int', 0, 5),
+    ('productivity_metrics', 'code_commits', 'int', 0, 80),
+    ('productivity_metrics', 'ticket_resolution_time', 'float', 0, 96),
+    ('productivity_metrics', 'performance_trend', 'trend', 0, 0),
+    ('productivity_metrics', 'skill_utilization', 'float', 0, 1),
+    ('productivity_metrics', 'workload_balance', 'float', 0, 1),
+]
+
+SECTIONS = ['slack_metrics', 'email_metrics', 'calendar_metrics', 'productivity_metrics']
+
+def generate_payloads(n_rows: int, seed: int = 0, start: int = 0) -> List[Dict]:
+    """n_rows payloads; the same (seed, start) always yields the same rows"""
+    rng = np.random.default_rng([seed, start])
+    columns = {}
+    for section, field, kind, low, high in PAYLOAD_FIELDS:
+        if kind == 'int':
+            values = rng.integers(low, high, size=n_rows, endpoint=True)
+        elif kind == 'float':
+            values = rng.uniform(low, high, size=n_rows)
+        else:
+            values = np.array(TRENDS, dtype=object)[rng.integers(0, len(TRENDS), size=n_rows)]
+        columns[(section, field)] = values.tolist()
+
+    departments = np.array(DEPARTMENTS, dtype=object)[rng.integers(0, len(DEPARTMENTS), size=n_rows)].tolist()
+    positions = np.array(POSITIONS, dtype=object)[rng.integers(0, len(POSITIONS), size=n_rows)].tolist()
+    tenure_days = rng.integers(0, 4000, size=n_rows).tolist()
+
+    fields_by_section = {section: [(field, columns[(s, field)]) for s, field, _, _, _ in PAYLOAD_FIELDS if s == section]
+                         for section in SECTIONS}
+    payloads = []
+    for i in range(n_rows):
+        payload = {
+            'employee_id': f'BENCH{start + i:07d}',
+            'basic_info': {'tenure_days': tenure_days[i], 'department': departments[i], 'position': positions[i]}
+        }
+        for section in SECTIONS:
+            payload[section] = {field: values[i] for field, values in fields_by_section[section]}
+        payloads.append(payload)
+    return payloads
+
+def iter_payload_chunks(n_rows: int, chunk_size: int = 100_000, seed: int = 0) -> Iterator[List[Dict]]:
+    """Yield n_rows payloads in chunks of at most chunk_size"""
+    for start in range(0, n_rows, chunk_size):
+        yield generate_payloads(min(chunk_size, n_rows - start), seed=seed, start=start)
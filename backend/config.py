@@ -13,6 +13,7 @@ class Settings(BaseSettings):
     
     # Database - Using SQLite for local development
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./retention.db")
+    AUTO_CREATE_SCHEMA: bool = True  # Create missing tables at startup; disable when migrations run separately
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
     
     # Security
@@ -32,9 +33,35 @@ class Settings(BaseSettings):
     MICROSOFT_TENANT_ID: str = os.getenv("MICROSOFT_TENANT_ID", "")
     
     # ML Settings
-    MODEL_PATH: str = "models/retention_model.pkl"
+    MODEL_PATH: str = "models/retention_model.pkl"  # Legacy single-file model, used if the registry is empty
+    MODEL_REGISTRY_DIR: str = "models/registry"
+    MODEL_REGISTRY_POLL_SECONDS: int = 30  # 0 disables the registry watcher
     PREDICTION_THRESHOLD: float = 0.75
     WARNING_PERIOD_DAYS: int = 90
+    PREDICTION_BATCH_SIZE: int = 4096  # Rows per predict_proba call in batch scoring
+    INFERENCE_BACKEND: str = "booster"  # "booster" (native XGBoost engine), "onnx" or "sklearn"
+    ONNX_EXPORT: bool = True  # Export each saved model version to ONNX as well
+    ONNX_INTRA_OP_THREADS: int = 1
+    ONNX_PARITY_TOLERANCE: float = 1e-4
+    PREDICTION_CACHE_SIZE: int = 10000  # 0 disables the prediction cache
+    PREDICTION_CACHE_TTL_SECONDS: int = 3600
+    MICRO_BATCH_ENABLED: bool = True  # Coalesce concurrent single predictions into batches
+    MICRO_BATCH_WINDOW_MS: float = 2.0
+    MICRO_BATCH_MAX_SIZE: int = 64
+    SCORING_WORKERS: int = 1  # Processes for company-wide scoring; 0 uses every core
+    PARALLEL_SCORING_MIN_ROWS: int = 5000  # Smaller jobs are scored in-process
+    EXPLANATIONS_ENABLED: bool = True  # Attach TreeSHAP drivers to model predictions
+    EXPLANATION_TOP_K: int = 5
+    EXPLANATION_CACHE_SIZE: int = 10000
+    HYPERPARAMETER_SEARCH_DB: str = "models/hyperparameter_search.sqlite"  # Trial checkpoints for resumable searches
+    INCREMENTAL_MODE: str = "continue"  # "continue" boosting from the active model or refit on a sliding "window"
+    INCREMENTAL_BOOST_ROUNDS: int = 25  # Trees added per warm-start run
+    INCREMENTAL_WINDOW_DAYS: int = 365  # Labeled history used by window refits
+    INCREMENTAL_MIN_LABELS: int = 50  # Skip a run with fewer new labeled predictions
+    INCREMENTAL_HOLDOUT_FRACTION: float = 0.2  # Share of employees held out to validate the candidate
+    INCREMENTAL_MIN_IMPROVEMENT: float = 0.0  # Holdout AUC gain the candidate must exceed to be promoted
+    FEATURE_STORE_DIR: str = "data/feature_store"  # Day-partitioned Parquet snapshots of feature vectors
+    FEATURE_STORE_MAX_STALENESS_DAYS: int = 2  # Older vectors are ignored by scoring and point-in-time joins
     
     # Alert Settings
     ALERT_EMAIL: str = os.getenv("ALERT_EMAIL", "")
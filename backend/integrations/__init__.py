@@ -1,6 +1,16 @@
-from .slack_integration import SlackIntegration
-from .email_integration import EmailIntegration
-from .calendar_integration import CalendarIntegration
-from .productivity_integration import ProductivityIntegration
+import importlib
 
-__all__ = ['SlackIntegration', 'EmailIntegration', 'CalendarIntegration', 'ProductivityIntegration']
\ No newline at end of file
+# Imported on first use: slack_sdk, googleapiclient and textblob are slow to load
+_LAZY_EXPORTS = {
+    'SlackIntegration': '.slack_integration',
+    'EmailIntegration': '.email_integration',
+    'CalendarIntegration': '.calendar_integration',
+    'ProductivityIntegration': '.productivity_integration',
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ['SlackIntegration', 'EmailIntegration', 'CalendarIntegration', 'ProductivityIntegration']
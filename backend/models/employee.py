@@ -33,6 +33,8 @@ class Employee(Base):
     current_risk_score = Column(Float, default=0.0)
     risk_factors = Column(JSON, default=lambda: [])
     last_prediction_date = Column(DateTime, nullable=True)
+    input_fingerprint = Column(String, nullable=True)  # Hash of HRIS + integration inputs + model version at last scoring
+    needs_rescore = Column(Boolean, default=True, index=True)
     
     # Status
     is_active = Column(Boolean, default=True)
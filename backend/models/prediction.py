@@ -25,6 +25,7 @@ class Prediction(Base):
     # Model metadata
     model_version = Column(String)
     feature_importance = Column(JSON, default=lambda: {})
+    feature_vector = Column(JSON, nullable=True)  # The FeatureExtractor values that were scored, for retraining
     
     # Outcome tracking (for model improvement)
     actual_outcome = Column(String, nullable=True)  # stayed, left, promoted, etc.
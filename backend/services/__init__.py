@@ -1,6 +1,17 @@
-from .data_collector import DataCollector
-from .feature_extractor import FeatureExtractor
-from .ml_predictor import MLPredictor
-from .alert_service import AlertService
+import importlib
 
-__all__ = ['DataCollector', 'FeatureExtractor', 'MLPredictor', 'AlertService']
\ No newline at end of file
+# Submodules are imported on first attribute access (PEP 562), so importing one
+# service doesn't drag in the integrations, pandas or the ML stack.
+_LAZY_EXPORTS = {
+    'DataCollector': '.data_collector',
+    'FeatureExtractor': '.feature_extractor',
+    'MLPredictor': '.ml_predictor',
+    'AlertService': '.alert_service',
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ['DataCollector', 'FeatureExtractor', 'MLPredictor', 'AlertService']
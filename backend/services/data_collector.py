@@ -1,5 +1,5 @@
 import logging
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional
 import pandas as pd
 from sqlalchemy.orm import Session
@@ -12,6 +12,10 @@ from models.employee import Employee
 
 logger = logging.getLogger(__name__)
 
+def _as_date(value) -> date:
+    """hire_date is a Date column, but rows built in code may hold a datetime"""
+    return value.date() if isinstance(value, datetime) else value
+
 class DataCollector:
     def __init__(self, db_session: Session):
         self.db = db_session
@@ -45,19 +49,21 @@ class DataCollector:
             'basic_info': {
                 'department': employee.department,
                 'position': employee.position,
-                'tenure_days': (datetime.now() - employee.hire_date).days if employee.hire_date else 0
+                'tenure_days': (date.today() - _as_date(employee.hire_date)).days if employee.hire_date else 0
             }
         }
         
-        # Collect from each integration
-        if employee.slack_user_id:
-            data['slack_metrics'] = self.collect_slack_data(employee.slack_user_id)
+        # Collect from each integration; Employee has no integration ids of its own yet
+        slack_user_id = getattr(employee, 'slack_user_id', None)
+        if slack_user_id:
+            data['slack_metrics'] = self.collect_slack_data(slack_user_id)
         
         if employee.email:
             data['email_metrics'] = self.collect_email_data(employee.email)
         
-        if employee.calendar_id:
-            data['calendar_metrics'] = self.collect_calendar_data(employee.calendar_id)
+        calendar_id = getattr(employee, 'calendar_id', None)
+        if calendar_id:
+            data['calendar_metrics'] = self.collect_calendar_data(calendar_id)
         
         data['productivity_metrics'] = self.collect_productivity_data(employee.employee_id)
         
@@ -0,0 +1,78 @@
+import logging
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import settings
+from services.feature_extractor import FEATURE_NAMES
+from services.inference_engine import BoosterInferenceEngine, scaler_params, standard_scale
+from services.prediction_cache import PredictionCache
+
+logger = logging.getLogger(__name__)
+
+class RiskExplainer:
+    """Per-employee drivers of a prediction from XGBoost TreeSHAP contributions
+
+    A whole batch is scaled and passed to Booster.predict(pred_contribs=True)
+    once; each row's contributions (log-odds, bias column dropped) are mapped
+    onto FEATURE_NAMES and the top_k by magnitude are kept. Results are cached
+    per (feature hash, model version), so re-scoring or re-viewing unchanged
+    inputs never recomputes SHAP values.
+    """
+
+    def __init__(self, model, scaler, model_version: Optional[str], top_k: Optional[int] = None,
+                 cache: Optional[PredictionCache] = None):
+        self.booster = model.get_booster()
+        # Scaled exactly as the model scores them, so drivers explain the splits actually taken
+        self.mean, self.scale = scaler_params(scaler)
+        self.model_version = model_version
+        self.iteration_range = BoosterInferenceEngine._iteration_range(model)
+        self.top_k = top_k or settings.EXPLANATION_TOP_K
+        self.cache = cache if cache is not None else PredictionCache(
+            max_size=settings.EXPLANATION_CACHE_SIZE,
+            ttl_seconds=settings.PREDICTION_CACHE_TTL_SECONDS
+        )
+
+    @staticmethod
+    def supports(model, scaler) -> bool:
+        """TreeSHAP needs the native XGBoost model (not an ONNX session)"""
+        return settings.EXPLANATIONS_ENABLED and BoosterInferenceEngine.supports(model, scaler)
+
+    def explain(self, features: np.ndarray) -> List[List[Dict]]:
+        """Top-k drivers for each row of a raw (unscaled) feature matrix"""
+        keys = [self.cache.make_key(row, self.model_version) for row in features]
+        drivers = [self.cache.get(key) for key in keys]
+
+        missing = [i for i, row_drivers in enumerate(drivers) if row_drivers is None]
+        if missing:
+            contributions = self.contributions(features[missing])
+            for i, row_contributions in zip(missing, contributions):
+                drivers[i] = self._top_drivers(features[i], row_contributions)
+                self.cache.put(keys[i], drivers[i])
+        return drivers
+
+    def contributions(self, features: np.ndarray) -> np.ndarray:
+        """(n, 34) SHAP contributions from a single pred_contribs call"""
+        import xgboost as xgb
+
+        scaled = standard_scale(features, self.mean, self.scale)
+        contributions = self.booster.predict(
+            xgb.DMatrix(scaled),
+            pred_contribs=True,
+            iteration_range=self.iteration_range,
+            validate_features=False
+        )
+        return contributions[:, :-1]  # Last column is the bias term
+
+    def _top_drivers(self, features: np.ndarray, contributions: np.ndarray) -> List[Dict]:
+        top = np.argsort(-np.abs(contributions), kind='stable')[:self.top_k]
+        return [{
+            'feature': FEATURE_NAMES[j],
+            'value': float(features[j]),
+            'contribution': float(contributions[j]),
+            'direction': 'increases_risk' if contributions[j] > 0 else 'decreases_risk'
+        } for j in top]
+
+def drivers_to_importance(drivers: List[Dict]) -> Dict[str, float]:
+    """Compact {feature: contribution} form stored in Prediction.feature_importance"""
+    return {driver['feature']: driver['contribution'] for driver in drivers}
@@ -1,11 +1,80 @@
 import numpy as np
-import pandas as pd
-from typing import Dict, List
+from typing import TYPE_CHECKING, Dict, List, Tuple, Union
 from datetime import datetime, timedelta
 import logging
 
+if TYPE_CHECKING:
+    import pandas as pd  # Imported on first batch; keeps single predictions and API startup light
+
 logger = logging.getLogger(__name__)
 
+FEATURE_NAMES = [
+    'tenure_years', 'department', 'position_level',
+    'slack_messages', 'slack_response_time', 'slack_channels',
+    'slack_sentiment', 'slack_after_hours', 'slack_trend',
+    'email_sent', 'email_received', 'email_response_time',
+    'email_unread', 'email_after_hours', 'email_sentiment',
+    'email_external', 'meeting_hours', 'meetings_declined',
+    'one_on_ones', 'recurring_dropped', 'meeting_participation',
+    'calendar_fragmentation', 'pto_days', 'task_completion',
+    'project_involvement', 'code_commits', 'ticket_resolution',
+    'performance_trend', 'skill_utilization', 'workload_balance',
+    'comm_balance', 'engagement', 'burnout_risk', 'isolation'
+]
+
+# Bump whenever a feature's definition changes; feature-store vectors are keyed by it
+FEATURE_EXTRACTOR_VERSION = 1
+
+# Source field for each non-derived feature: (section, field, divisor or encoder).
+# Flattened DataFrames use "<section>.<field>" columns, as produced by pd.json_normalize.
+FEATURE_SOURCES = [
+    ('basic_info', 'tenure_days', 365),
+    ('basic_info', 'department', 'department'),
+    ('basic_info', 'position', 'position'),
+    ('slack_metrics', 'message_count', 100),
+    ('slack_metrics', 'avg_response_time', 60),
+    ('slack_metrics', 'active_channels', 10),
+    ('slack_metrics', 'sentiment_score', 1),
+    ('slack_metrics', 'after_hours_messages', 100),
+    ('slack_metrics', 'participation_trend', 'trend'),
+    ('email_metrics', 'sent_count', 100),
+    ('email_metrics', 'received_count', 100),
+    ('email_metrics', 'avg_response_time', 24),
+    ('email_metrics', 'unread_percentage', 100),
+    ('email_metrics', 'after_hours_emails', 100),
+    ('email_metrics', 'email_sentiment', 1),
+    ('email_metrics', 'external_communication', 100),
+    ('calendar_metrics', 'meeting_hours', 40),
+    ('calendar_metrics', 'meetings_declined', 100),
+    ('calendar_metrics', 'one_on_ones', 10),
+    ('calendar_metrics', 'recurring_meetings_dropped', 1),
+    ('calendar_metrics', 'meeting_participation', 1),
+    ('calendar_metrics', 'calendar_fragmentation', 1),
+    ('calendar_metrics', 'pto_days', 20),
+    ('productivity_metrics', 'task_completion_rate', 1),
+    ('productivity_metrics', 'project_involvement', 5),
+    ('productivity_metrics', 'code_commits', 50),
+    ('productivity_metrics', 'ticket_resolution_time', 48),
+    ('productivity_metrics', 'performance_trend', 'trend'),
+    ('productivity_metrics', 'skill_utilization', 1),
+    ('productivity_metrics', 'workload_balance', 1),
+]
+
+# Raw inputs read by the risk-factor and fallback rules in MLPredictor.
+# Trend columns hold 1.0 where the trend is exactly 'declining'. Metrics that
+# were not collected are NaN, which no threshold rule matches, so an employee
+# without integration data is not flagged as disengaged or overloaded.
+RULE_INPUT_SOURCES = [
+    ('slack_metrics', 'participation_trend'),
+    ('slack_metrics', 'message_count'),
+    ('slack_metrics', 'sentiment_score'),
+    ('slack_metrics', 'after_hours_messages'),
+    ('calendar_metrics', 'meetings_declined'),
+    ('productivity_metrics', 'performance_trend'),
+    ('productivity_metrics', 'workload_balance'),
+]
+RULE_TREND_FIELDS = {'participation_trend', 'performance_trend'}
+
 class FeatureExtractor:
     def __init__(self):
         self.feature_columns = []
@@ -74,6 +143,115 @@ class FeatureExtractor:
         
         return np.array(features)
     
+    def extract_batch(self, employees: Union[List[Dict], 'pd.DataFrame'],
+                      dtype=np.float32) -> Tuple[np.ndarray, List[str]]:
+        """Extract a contiguous (n, 34) feature matrix for many employees at once
+        
+        Accepts a list of nested employee payloads or a DataFrame of flattened
+        metrics ("slack_metrics.message_count", ...). Row i matches
+        extract_features(employees[i]); pass dtype=np.float64 for bit-identical values.
+        """
+        n_rows = len(employees)
+        columns = self._collect_columns(employees)
+        matrix = np.empty((n_rows, len(FEATURE_NAMES)), dtype=dtype)
+        
+        for j, (section, field, transform) in enumerate(FEATURE_SOURCES):
+            values = columns[(section, field)]
+            if transform == 'department':
+                matrix[:, j] = self._encode_column(values, self._encode_department, '')
+            elif transform == 'position':
+                matrix[:, j] = self._encode_column(values, self._encode_position_level, '')
+            elif transform == 'trend':
+                matrix[:, j] = self._encode_column(values, self._encode_trend, 'stable')
+            elif transform == 1:
+                matrix[:, j] = self._numeric_column(values)
+            else:
+                matrix[:, j] = self._numeric_column(values) / transform
+        
+        # Derived features as column operations
+        slack_activity = self._numeric_column(columns[('slack_metrics', 'message_count')])
+        email_activity = self._numeric_column(columns[('email_metrics', 'sent_count')])
+        meeting_participation = self._numeric_column(columns[('calendar_metrics', 'meeting_participation')])
+        slack_sentiment = self._numeric_column(columns[('slack_metrics', 'sentiment_score')])
+        after_hours_slack = self._numeric_column(columns[('slack_metrics', 'after_hours_messages')])
+        after_hours_email = self._numeric_column(columns[('email_metrics', 'after_hours_emails')])
+        meeting_hours = self._numeric_column(columns[('calendar_metrics', 'meeting_hours')])
+        active_channels = self._numeric_column(columns[('slack_metrics', 'active_channels')])
+        one_on_ones = self._numeric_column(columns[('calendar_metrics', 'one_on_ones')])
+        
+        derived_start = len(FEATURE_SOURCES)
+        matrix[:, derived_start] = (
+            np.abs(slack_activity - email_activity) / np.maximum(slack_activity + email_activity, 1)
+        )
+        matrix[:, derived_start + 1] = (meeting_participation + slack_sentiment) / 2
+        matrix[:, derived_start + 2] = (
+            (after_hours_slack + after_hours_email) / 200 + np.minimum(meeting_hours / 40, 1)
+        )
+        matrix[:, derived_start + 3] = 1 - (
+            np.minimum(active_channels / 10, 1) + np.minimum(one_on_ones / 5, 1)
+        ) / 2
+        
+        return matrix, list(FEATURE_NAMES)
+    
+    def extract_rule_inputs(self, employees: List[Dict]) -> np.ndarray:
+        """Extract the raw rule inputs as an (n, len(RULE_INPUT_SOURCES)) float64 matrix"""
+        matrix = np.empty((len(employees), len(RULE_INPUT_SOURCES)), dtype=np.float64)
+        sections = {}
+        for j, (section, field) in enumerate(RULE_INPUT_SOURCES):
+            if section not in sections:
+                sections[section] = [employee.get(section) or {} for employee in employees]
+            if field in RULE_TREND_FIELDS:
+                matrix[:, j] = [metrics.get(field) == 'declining' for metrics in sections[section]]
+            else:
+                matrix[:, j] = [metrics.get(field, np.nan) for metrics in sections[section]]
+        return matrix
+    
+    def rule_input_row(self, employee_data: Dict) -> List[float]:
+        """One employee's rule inputs as a plain list, for single predictions"""
+        row = []
+        for section, field in RULE_INPUT_SOURCES:
+            metrics = employee_data.get(section) or {}
+            if field in RULE_TREND_FIELDS:
+                row.append(1.0 if metrics.get(field) == 'declining' else 0.0)
+            else:
+                value = metrics.get(field)
+                row.append(float('nan') if value is None else value)
+        return row
+    
+    def _collect_columns(self, employees: Union[List[Dict], 'pd.DataFrame']) -> Dict[Tuple[str, str], list]:
+        """Gather each source field as one column, with extract_features defaults"""
+        import pandas as pd
+        
+        columns = {}
+        if isinstance(employees, pd.DataFrame):
+            for section, field, _ in FEATURE_SOURCES:
+                name = f"{section}.{field}"
+                if name in employees.columns:
+                    columns[(section, field)] = employees[name].tolist()
+                else:
+                    columns[(section, field)] = [None] * len(employees)
+            return columns
+        
+        sections = {}
+        for section, field, _ in FEATURE_SOURCES:
+            if section not in sections:
+                sections[section] = [employee.get(section) or {} for employee in employees]
+            columns[(section, field)] = [metrics.get(field) for metrics in sections[section]]
+        return columns
+    
+    def _numeric_column(self, values: list) -> np.ndarray:
+        """Convert a column to float64, treating missing values as 0"""
+        column = np.array(values, dtype=np.float64)
+        return np.nan_to_num(column, nan=0.0, copy=False)
+    
+    def _encode_column(self, values: list, encoder, default: str) -> np.ndarray:
+        """Encode a categorical column via a lookup over its unique values"""
+        import pandas as pd
+        
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object).fillna(default))
+        lookup = np.array([encoder(str(value)) for value in uniques], dtype=np.float64)
+        return lookup[codes]
+    
     def _calculate_derived_features(self, data: Dict) -> List[float]:
         """Calculate complex derived features"""
         derived = []
@@ -141,21 +319,7 @@ class FeatureExtractor:
     
     def get_feature_importance(self, model) -> Dict[str, float]:
         """Get feature importance from trained model"""
-        feature_names = [
-            'tenure_years', 'department', 'position_level',
-            'slack_messages', 'slack_response_time', 'slack_channels',
-            'slack_sentiment', 'slack_after_hours', 'slack_trend',
-            'email_sent', 'email_received', 'email_response_time',
-            'email_unread', 'email_after_hours', 'email_sentiment',
-            'email_external', 'meeting_hours', 'meetings_declined',
-            'one_on_ones', 'recurring_dropped', 'meeting_participation',
-            'calendar_fragmentation', 'pto_days', 'task_completion',
-            'project_involvement', 'code_commits', 'ticket_resolution',
-            'performance_trend', 'skill_utilization', 'workload_balance',
-            'comm_balance', 'engagement', 'burnout_risk', 'isolation'
-        ]
-        
         if hasattr(model, 'feature_importances_'):
             importances = model.feature_importances_
-            return dict(zip(feature_names, importances))
+            return dict(zip(FEATURE_NAMES, importances))
         return {}
\ No newline at end of file
@@ -0,0 +1,225 @@
+"""
+Offline feature store: each employee's 34-feature vector per day
+
+Snapshots are Parquet files partitioned by day,
+
+    FEATURE_STORE_DIR/snapshot_date=YYYY-MM-DD/features-v<FEATURE_EXTRACTOR_VERSION>.parquet
+
+with one row per employee: employee_id, computed_at, the fingerprint of the
+inputs the vector was built from, extractor_version and the FEATURE_NAMES
+columns exactly as FeatureExtractor.extract_batch built them. Readers only
+see files of the current extractor version, so vectors built by an older
+definition of the features are never mixed in.
+
+A vector is known from its computed_at time. The point-in-time join gives
+each labeled prediction the employee's latest vector computed at or before
+the prediction (and strictly before its outcome), so training never sees
+data from after the moment it is predicting. The batch scorer reads the
+same vectors, so training and serving agree; it only scores a stored vector
+whose input fingerprint matches the employee's current inputs. Run from
+the backend directory:
+
+    python -m services.feature_store snapshot [--company-id ID] [--collect]
+    python -m services.feature_store training-set --output training.parquet
+"""
+
+import argparse
+import logging
+import os
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.employee import Employee
+from models.prediction import Prediction
+from services.feature_extractor import FEATURE_EXTRACTOR_VERSION, FEATURE_NAMES, FeatureExtractor
+from services.predictor_service import build_scoring_payload
+
+if TYPE_CHECKING:
+    import pandas as pd  # Imported on first read; keeps API startup light
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = 'snapshot_date='
+VECTOR_COLUMNS = ['employee_id', 'computed_at', 'input_fingerprint', *FEATURE_NAMES]
+
+class FeatureStore:
+    """Daily feature vectors in day-partitioned Parquet, read back as of a point in time"""
+
+    def __init__(self, root: Optional[str] = None, extractor_version: int = FEATURE_EXTRACTOR_VERSION):
+        self.root = Path(root or settings.FEATURE_STORE_DIR)
+        self.extractor_version = extractor_version
+
+    def partition_path(self, snapshot_date: date) -> Path:
+        return self.root / f"{PARTITION_PREFIX}{snapshot_date.isoformat()}" / f"features-v{self.extractor_version}.parquet"
+
+    def write(self, employee_ids: List[str], features: np.ndarray, computed_at: Optional[datetime] = None,
+              input_fingerprints: Optional[List[str]] = None) -> Path:
+        """Store one vector per employee in computed_at's day, replacing their earlier vectors from that day
+
+        input_fingerprints (see rescoring.compute_input_fingerprint, without a
+        model version) identify the inputs each vector was built from.
+        """
+        import pandas as pd
+
+        computed_at = computed_at or datetime.now()
+        frame = pd.DataFrame(np.asarray(features, dtype=np.float64), columns=FEATURE_NAMES)
+        frame.insert(0, 'employee_id', [str(employee_id) for employee_id in employee_ids])
+        frame.insert(1, 'computed_at', pd.Timestamp(computed_at))
+        frame.insert(2, 'input_fingerprint', pd.array(input_fingerprints or [None] * len(frame), dtype='string'))
+        frame.insert(3, 'extractor_version', np.int32(self.extractor_version))
+
+        path = self.partition_path(computed_at.date())
+        if path.exists():
+            existing = pd.read_parquet(path)
+            frame = pd.concat([existing[~existing['employee_id'].isin(frame['employee_id'])], frame],
+                              ignore_index=True)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Dot-prefixed files are skipped by readers, so a partition is never seen half-written
+        temporary = path.with_name(f".{path.name}.tmp")
+        frame.to_parquet(temporary, index=False)
+        os.replace(temporary, path)
+        logger.info(f"Feature store: wrote {len(employee_ids)} vectors to {path} ({len(frame)} that day)")
+        return path
+
+    def snapshot(self, db: Session, collector=None, company_id: Optional[str] = None,
+                 computed_at: Optional[datetime] = None) -> Dict:
+        """Extract and store the current vector of every active employee"""
+        query = db.query(Employee).filter(Employee.is_active == True)
+        if company_id:
+            query = query.filter(Employee.company_id == company_id)
+        employees = query.all()
+        if not employees:
+            return {'employees': 0, 'path': None}
+
+        from services.rescoring import compute_input_fingerprint
+
+        payloads = [build_scoring_payload(employee, collector) for employee in employees]
+        features, _ = FeatureExtractor().extract_batch(payloads, dtype=np.float64)
+        fingerprints = [compute_input_fingerprint(employee, payload, None)
+                        for employee, payload in zip(employees, payloads)]
+        path = self.write([employee.employee_id for employee in employees], features, computed_at, fingerprints)
+        return {'employees': len(employees), 'path': str(path)}
+
+    def read(self, start: Optional[date] = None, end: Optional[date] = None,
+             employee_ids: Optional[List[str]] = None) -> 'pd.DataFrame':
+        """Vectors (employee_id, computed_at, features) from the days start..end inclusive"""
+        import pyarrow.dataset as ds
+
+        paths = []
+        for path in sorted(self.root.glob(f"{PARTITION_PREFIX}*/features-v{self.extractor_version}.parquet")):
+            day = path.parent.name[len(PARTITION_PREFIX):]
+            if (start is None or day >= start.isoformat()) and (end is None or day <= end.isoformat()):
+                paths.append(str(path))
+
+        if not paths:
+            return _empty_vectors()
+
+        condition = None
+        if employee_ids is not None:
+            condition = ds.field('employee_id').isin([str(employee_id) for employee_id in employee_ids])
+        frame = ds.dataset(paths, format='parquet').to_table(columns=VECTOR_COLUMNS, filter=condition).to_pandas()
+        return frame.astype({'computed_at': 'datetime64[ns]'})
+
+    def latest(self, employee_ids: List[str], as_of: Optional[datetime] = None,
+               max_staleness_days: Optional[int] = None) -> 'pd.DataFrame':
+        """Each employee's newest vector computed at or before as_of, indexed by employee_id"""
+        as_of = as_of or datetime.now()
+        staleness = timedelta(days=settings.FEATURE_STORE_MAX_STALENESS_DAYS
+                              if max_staleness_days is None else max_staleness_days)
+        frame = self.read((as_of - staleness).date(), as_of.date(), employee_ids)
+        frame = frame[(frame['computed_at'] <= as_of) & (frame['computed_at'] >= as_of - staleness)]
+        return frame.sort_values('computed_at').drop_duplicates('employee_id', keep='last').set_index('employee_id')
+
+    def point_in_time_join(self, events: 'pd.DataFrame', max_staleness_days: Optional[int] = None) -> 'pd.DataFrame':
+        """Attach to each event (employee_id, as_of[, outcome_date]) the vector known at as_of
+
+        The vector is the employee's latest one computed at or before as_of and
+        strictly before outcome_date, at most max_staleness_days old. Events
+        without such a vector are dropped.
+        """
+        import pandas as pd
+
+        staleness = pd.Timedelta(days=settings.FEATURE_STORE_MAX_STALENESS_DAYS
+                                 if max_staleness_days is None else max_staleness_days)
+        events = events.assign(employee_id=events['employee_id'].astype(str),
+                               as_of=pd.to_datetime(events['as_of']).astype('datetime64[ns]'))
+        cutoff = events['as_of']
+        if 'outcome_date' in events.columns:
+            # A vector computed once the outcome is known would leak the label
+            outcome_date = pd.to_datetime(events['outcome_date']).astype('datetime64[ns]')
+            cutoff = cutoff.where(outcome_date.isna() | (cutoff < outcome_date), outcome_date - pd.Timedelta(1, 'us'))
+        events = events.assign(cutoff=cutoff).sort_values('cutoff', kind='stable')
+        if events.empty:
+            vectors = _empty_vectors()
+        else:
+            vectors = self.read((events['cutoff'].min() - staleness).date(), events['cutoff'].max().date(),
+                                events['employee_id'].unique().tolist())
+        joined = pd.merge_asof(events, vectors.sort_values('computed_at'), left_on='cutoff', right_on='computed_at',
+                               by='employee_id', direction='backward', tolerance=staleness)
+        matched = joined['computed_at'].notna()
+        logger.info(f"Point-in-time join: {int(matched.sum())} of {len(joined)} events have a feature vector")
+        return joined[matched].drop(columns='cutoff').reset_index(drop=True)
+
+    def training_set(self, db: Session, since: Optional[datetime] = None) -> 'pd.DataFrame':
+        """MLPredictor training frame (employee_id, departed, features) from labeled predictions
+
+        Every prediction with an actual_outcome is one example, featurized as
+        of its prediction_date through point_in_time_join.
+        """
+        import pandas as pd
+
+        from services.incremental_training import DEPARTED_OUTCOMES
+
+        query = db.query(
+            Prediction.employee_id, Prediction.prediction_date, Prediction.actual_outcome, Prediction.outcome_date
+        ).filter(Prediction.actual_outcome.isnot(None))
+        if since is not None:
+            query = query.filter(Prediction.outcome_date > since)
+        events = pd.DataFrame(query.all(), columns=['employee_id', 'as_of', 'actual_outcome', 'outcome_date'])
+        events['departed'] = events['actual_outcome'].str.lower().isin(DEPARTED_OUTCOMES).astype(int)
+        return self.point_in_time_join(events)[['employee_id', 'departed', *FEATURE_NAMES]]
+
+def _empty_vectors() -> 'pd.DataFrame':
+    import pandas as pd
+
+    frame = pd.DataFrame({column: pd.Series(dtype=np.float64) for column in VECTOR_COLUMNS})
+    return frame.astype({'employee_id': object, 'computed_at': 'datetime64[ns]', 'input_fingerprint': 'string'})
+
+def main():
+    parser = argparse.ArgumentParser(description='Write feature snapshots or build training sets from them')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    snapshot = subparsers.add_parser('snapshot', help="Store today's vector for every active employee")
+    snapshot.add_argument('--company-id', help='Only snapshot one company')
+    snapshot.add_argument('--collect', action='store_true',
+                          help='Pull integration metrics through DataCollector (default: HRIS fields only)')
+    training = subparsers.add_parser('training-set', help='Point-in-time training set from labeled predictions')
+    training.add_argument('--output', required=True, help='Parquet file, usable as hyperparameter_search --data')
+    parser.add_argument('--root', help='Default: FEATURE_STORE_DIR')
+    args = parser.parse_args()
+
+    from app import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    store = FeatureStore(args.root)
+    db = SessionLocal()
+    try:
+        if args.command == 'snapshot':
+            collector = None
+            if args.collect:
+                from services.data_collector import DataCollector
+                collector = DataCollector(db)
+            logger.info(f"Feature snapshot: {store.snapshot(db, collector, args.company_id)}")
+        else:
+            training_data = store.training_set(db)
+            training_data.to_parquet(args.output, index=False)
+            logger.info(f"Wrote {len(training_data)} training rows to {args.output}")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Successive-halving hyperparameter search for the XGBoost retention model
+
+Samples n_trials configurations from SEARCH_SPACE, trains each for
+min_rounds boosting rounds and keeps the best 1/eta for the next rung at eta
+times the rounds, until max_rounds. Trials in a rung run across a process
+pool; every finished trial is written to a SQLite checkpoint, so an
+interrupted search resumes where it stopped. The winning configuration is
+then trained with MLPredictor.train_model and published to the model registry
+with the search summary in its metadata. Run from the backend directory:
+
+    python -m services.hyperparameter_search [--trials 27] [--eta 3] [--data training.parquet | --feature-store]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# name: (kind, low, high); 'log' samples uniformly in log space
+SEARCH_SPACE = {
+    'max_depth': ('int', 3, 10),
+    'learning_rate': ('log', 0.01, 0.3),
+    'subsample': ('float', 0.5, 1.0),
+    'colsample_bytree': ('float', 0.5, 1.0),
+    'min_child_weight': ('log', 1.0, 20.0),
+    'reg_lambda': ('log', 0.1, 10.0),
+    'gamma': ('float', 0.0, 5.0)
+}
+
+# Per-process validation split, set up by _init_worker
+_worker_data: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]] = None
+
+def sample_configurations(n_trials: int, seed: int) -> List[Dict]:
+    """n_trials configurations; the same seed always yields the same list"""
+    rng = np.random.default_rng(seed)
+    configurations = []
+    for _ in range(n_trials):
+        params = {}
+        for name, (kind, low, high) in SEARCH_SPACE.items():
+            if kind == 'int':
+                params[name] = int(rng.integers(low, high, endpoint=True))
+            elif kind == 'log':
+                params[name] = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+            else:
+                params[name] = float(rng.uniform(low, high))
+        configurations.append(params)
+    return configurations
+
+def rung_budgets(min_rounds: int, max_rounds: int, eta: int) -> List[int]:
+    """Boosting rounds per rung: min_rounds, min_rounds * eta, ... capped at max_rounds"""
+    budgets = [min_rounds]
+    while budgets[-1] * eta <= max_rounds:
+        budgets.append(budgets[-1] * eta)
+    return budgets
+
+class TrialStore:
+    """SQLite checkpoint of one search: its settings and every finished trial"""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS search (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS trials (
+                trial_id INTEGER NOT NULL,
+                rung INTEGER NOT NULL,
+                n_estimators INTEGER NOT NULL,
+                params TEXT NOT NULL,
+                score REAL NOT NULL,
+                fit_seconds REAL NOT NULL,
+                completed_at TEXT NOT NULL,
+                PRIMARY KEY (trial_id, rung)
+            );
+        """)
+
+    def check_config(self, config: Dict):
+        """Record the search settings, or refuse to resume a search run with different ones"""
+        row = self.conn.execute("SELECT value FROM search WHERE key = 'config'").fetchone()
+        if row is None:
+            with self.conn:
+                self.conn.execute("INSERT INTO search (key, value) VALUES ('config', ?)",
+                                  (json.dumps(config, sort_keys=True),))
+        elif json.loads(row[0]) != config:
+            raise ValueError(f"{self.path} holds a search with different settings or data; "
+                             f"use another --db to start a new search")
+
+    def results(self, rung: int) -> Dict[int, float]:
+        """{trial_id: score} of the trials already finished in a rung"""
+        rows = self.conn.execute("SELECT trial_id, score FROM trials WHERE rung = ?", (rung,))
+        return dict(rows.fetchall())
+
+    def record(self, trial_id: int, rung: int, n_estimators: int, params: Dict, score: float, fit_seconds: float):
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO trials VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (trial_id, rung, n_estimators, json.dumps(params), score, fit_seconds, datetime.now().isoformat())
+            )
+
+    def close(self):
+        self.conn.close()
+
+class SuccessiveHalvingSearch:
+    """Resumable successive-halving search over SEARCH_SPACE"""
+
+    def __init__(self, X: np.ndarray, y: np.ndarray, db_path: Optional[str] = None, n_trials: int = 27,
+                 eta: int = 3, min_rounds: int = 25, max_rounds: int = 675, workers: Optional[int] = None,
+                 seed: int = 42):
+        self.X = np.asarray(X, dtype=np.float32)
+        self.y = np.asarray(y)
+        self.db_path = db_path or settings.HYPERPARAMETER_SEARCH_DB
+        self.n_trials = n_trials
+        self.eta = eta
+        self.budgets = rung_budgets(min_rounds, max_rounds, eta)
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+
+    def run(self) -> Dict:
+        """Run (or resume) the search and return the best trial"""
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+
+        X_train, X_val, y_train, y_val = train_test_split(
+            self.X, self.y, test_size=0.2, random_state=self.seed, stratify=self.y
+        )
+        scaler = StandardScaler().fit(X_train)
+        data = (scaler.transform(X_train), y_train, scaler.transform(X_val), y_val)
+
+        configurations = sample_configurations(self.n_trials, self.seed)
+        store = TrialStore(self.db_path)
+        started = time.perf_counter()
+        try:
+            store.check_config(self._config())
+            survivors = list(range(self.n_trials))
+            context = multiprocessing.get_context('spawn')  # fork is unsafe after OpenMP/threads start
+            with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                     initializer=_init_worker, initargs=(data,)) as pool:
+                for rung, n_estimators in enumerate(self.budgets):
+                    scores = self._run_rung(pool, store, rung, n_estimators, survivors, configurations)
+                    ranked = sorted(survivors, key=lambda trial_id: scores[trial_id], reverse=True)
+                    logger.info(f"Rung {rung}: {len(survivors)} trials x {n_estimators} rounds, "
+                                f"best AUC {scores[ranked[0]]:.4f} (trial {ranked[0]})")
+                    if rung < len(self.budgets) - 1:
+                        survivors = ranked[:max(1, len(survivors) // self.eta)]
+        finally:
+            store.close()
+
+        best_id = ranked[0]
+        return {
+            'trial_id': best_id,
+            'hyperparameters': {**configurations[best_id], 'n_estimators': self.budgets[-1]},
+            'validation_auc': scores[best_id],
+            'search': {**self._config(), 'db_path': self.db_path,
+                       'elapsed_seconds': time.perf_counter() - started}
+        }
+
+    def _run_rung(self, pool: ProcessPoolExecutor, store: TrialStore, rung: int, n_estimators: int,
+                  trial_ids: List[int], configurations: List[Dict]) -> Dict[int, float]:
+        """Scores for trial_ids at this rung, evaluating only those not already checkpointed"""
+        scores = store.results(rung)
+        pending = [trial_id for trial_id in trial_ids if trial_id not in scores]
+        if len(pending) < len(trial_ids):
+            logger.info(f"Rung {rung}: resuming with {len(trial_ids) - len(pending)} checkpointed trials")
+
+        futures = {
+            pool.submit(_evaluate_trial, configurations[trial_id], n_estimators, self.seed): trial_id
+            for trial_id in pending
+        }
+        for future in as_completed(futures):
+            trial_id = futures[future]
+            score, fit_seconds = future.result()
+            store.record(trial_id, rung, n_estimators, configurations[trial_id], score, fit_seconds)
+            scores[trial_id] = score
+        return scores
+
+    def _config(self) -> Dict:
+        """Settings that must match for a checkpoint to be resumed"""
+        return {
+            'n_trials': self.n_trials,
+            'eta': self.eta,
+            'budgets': self.budgets,
+            'seed': self.seed,
+            'data_sha1': hashlib.sha1(self.X.tobytes() + self.y.tobytes()).hexdigest()
+        }
+
+def _init_worker(data: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]):
+    """Receive the split once per worker instead of once per trial"""
+    global _worker_data
+    _worker_data = data
+
+def _evaluate_trial(params: Dict, n_estimators: int, seed: int) -> Tuple[float, float]:
+    """Validation AUC of one configuration at one budget (runs in a worker)"""
+    import xgboost as xgb
+    from sklearn.metrics import roc_auc_score
+
+    X_train, y_train, X_val, y_val = _worker_data
+    started = time.perf_counter()
+    model = xgb.XGBClassifier(
+        **params,
+        n_estimators=n_estimators,
+        objective='binary:logistic',
+        tree_method='hist',
+        n_jobs=1,
+        random_state=seed
+    )
+    model.fit(X_train, y_train, verbose=False)
+    fit_seconds = time.perf_counter() - started
+    return float(roc_auc_score(y_val, model.predict_proba(X_val)[:, 1])), fit_seconds
+
+def load_training_data(path: Optional[str]):
+    """MLPredictor training frame (employee_id, departed, features) from CSV/Parquet, or synthetic"""
+    import pandas as pd
+
+    from services.ml_predictor import MLPredictor
+
+    if not path:
+        return MLPredictor()._generate_synthetic_data()
+    df = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_csv(path)
+    if 'departed' not in df.columns:
+        raise ValueError(f"{path} has no 'departed' label column")
+    if 'employee_id' not in df.columns:
+        df.insert(0, 'employee_id', range(len(df)))
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--data', help='CSV/Parquet with departed plus the 34 features (default: synthetic)')
+    parser.add_argument('--feature-store', action='store_true',
+                        help='Train on labeled predictions joined point-in-time to the feature store')
+    parser.add_argument('--db', default=settings.HYPERPARAMETER_SEARCH_DB, help='SQLite checkpoint file')
+    parser.add_argument('--trials', type=int, default=27)
+    parser.add_argument('--eta', type=int, default=3, help='Keep 1/eta of trials per rung')
+    parser.add_argument('--min-rounds', type=int, default=25)
+    parser.add_argument('--max-rounds', type=int, default=675)
+    parser.add_argument('--workers', type=int, help='Worker processes (default: every core)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-publish', action='store_true', help='Only report the best configuration')
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    if args.feature_store:
+        from app import SessionLocal
+        from services.feature_store import FeatureStore
+
+        db = SessionLocal()
+        try:
+            training_data = FeatureStore().training_set(db)
+        finally:
+            db.close()
+    else:
+        training_data = load_training_data(args.data)
+    X = training_data.drop(['employee_id', 'departed'], axis=1).to_numpy()
+    y = training_data['departed'].to_numpy()
+    search = SuccessiveHalvingSearch(
+        X, y, db_path=args.db, n_trials=args.trials, eta=args.eta, min_rounds=args.min_rounds,
+        max_rounds=args.max_rounds, workers=args.workers, seed=args.seed
+    )
+    best = search.run()
+    logger.info(f"Best configuration (validation AUC {best['validation_auc']:.4f}): {best['hyperparameters']}")
+    if args.no_publish:
+        return
+
+    from services.ml_predictor import MLPredictor
+
+    predictor = MLPredictor()
+    if predictor.train_model(training_data, hyperparameters=best['hyperparameters'],
+                             metadata={'hyperparameter_search': {**best['search'],
+                                                                 'trial_id': best['trial_id'],
+                                                                 'validation_auc': best['validation_auc']}}):
+        logger.info(f"Published model version {predictor.model_version} with the best configuration")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Incremental retraining from recorded prediction outcomes
+
+Predictions store the feature vector they scored, and /employees/{id}/outcome
+labels them with what happened. With a FeatureStore, each labeled prediction
+is featurized by the point-in-time join instead, falling back to its stored
+vector when the store has none. This job collects the predictions labeled
+since the active model was built (its labels_through metadata) and either
+continues boosting the active XGBoost model on them ("continue") or refits on
+every label in the last INCREMENTAL_WINDOW_DAYS ("window"). A holdout of
+employees never seen in training scores the candidate against the active
+model; only a candidate more than INCREMENTAL_MIN_IMPROVEMENT better is
+published and activated. Run the weekly job from the backend directory with:
+
+    python -m services.incremental_training [--mode window] [--dry-run]
+"""
+
+import argparse
+import hashlib
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.prediction import Prediction
+from services.feature_extractor import FEATURE_NAMES
+from services.feature_store import FeatureStore
+from services.ml_predictor import DEFAULT_HYPERPARAMETERS, MLPredictor
+from services.model_registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+# actual_outcome values that count as a departure; every other outcome is a stay
+DEPARTED_OUTCOMES = {'left', 'resigned', 'terminated', 'departed'}
+
+def in_holdout(employee_id: str, fraction: float) -> bool:
+    """Stable per-employee holdout membership, so no employee is on both sides"""
+    digest = hashlib.blake2b(str(employee_id).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big') % 1000 < fraction * 1000
+
+def holdout_metrics(model, scaler, X: np.ndarray, y: np.ndarray) -> Dict[str, float]:
+    """AUC (when both classes are present) and log loss of a model on the holdout"""
+    from sklearn.metrics import log_loss, roc_auc_score
+
+    probabilities = model.predict_proba(scaler.transform(X))[:, 1]
+    metrics = {'log_loss': float(log_loss(y, probabilities, labels=[0, 1]))}
+    if len(np.unique(y)) == 2:
+        metrics['auc'] = float(roc_auc_score(y, probabilities))
+    return metrics
+
+class IncrementalTrainer:
+    """Warm-start or sliding-window retraining gated on a holdout comparison"""
+
+    def __init__(self, db: Session, registry: Optional[ModelRegistry] = None, mode: Optional[str] = None,
+                 feature_store: Optional[FeatureStore] = None):
+        self.db = db
+        self.registry = registry or ModelRegistry()
+        self.mode = mode or settings.INCREMENTAL_MODE
+        self.feature_store = feature_store
+        if self.mode not in ('continue', 'window'):
+            raise ValueError(f"Unknown incremental training mode: {self.mode}")
+
+    def collect(self, since: Optional[datetime]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, Optional[datetime]]:
+        """(features, labels, employee_ids, latest outcome_date) of labeled predictions after since"""
+        query = self.db.query(
+            Prediction.id, Prediction.employee_id, Prediction.prediction_date, Prediction.feature_vector,
+            Prediction.actual_outcome, Prediction.outcome_date
+        ).filter(Prediction.actual_outcome.isnot(None))
+        if self.feature_store is None:
+            query = query.filter(Prediction.feature_vector.isnot(None))
+        if since is not None:
+            query = query.filter(Prediction.outcome_date > since)
+        rows = query.all()
+        stored = self._stored_vectors(rows) if self.feature_store is not None and rows else {}
+        rows = [row for row in rows if row.id in stored or row.feature_vector is not None]
+        if not rows:
+            return np.empty((0, 0)), np.empty(0, dtype=int), np.empty(0, dtype=object), None
+
+        X = np.array([stored.get(row.id, row.feature_vector) for row in rows], dtype=np.float64)
+        y = np.array([row.actual_outcome.lower() in DEPARTED_OUTCOMES for row in rows], dtype=int)
+        employee_ids = np.array([row.employee_id for row in rows], dtype=object)
+        return X, y, employee_ids, max(row.outcome_date for row in rows)
+
+    def _stored_vectors(self, rows) -> Dict[int, np.ndarray]:
+        """Point-in-time feature-store vectors keyed by prediction id"""
+        import pandas as pd
+
+        events = pd.DataFrame([(row.id, row.employee_id, row.prediction_date, row.outcome_date) for row in rows],
+                              columns=['id', 'employee_id', 'as_of', 'outcome_date'])
+        joined = self.feature_store.point_in_time_join(events)
+        return dict(zip(joined['id'], joined[FEATURE_NAMES].to_numpy()))
+
+    def run(self, dry_run: bool = False) -> Dict:
+        """Train a candidate on new labels and promote it if it beats the active model on the holdout"""
+        started = datetime.now()
+        version, model_data = self.registry.load()
+        metadata = self.registry.read_manifest()['versions'].get(version, {})
+        model, scaler = model_data['model'], model_data['scaler']
+
+        if self.mode == 'continue':
+            labels_through = metadata.get('labels_through')
+            since = datetime.fromisoformat(labels_through) if labels_through else None
+        else:
+            since = started - timedelta(days=settings.INCREMENTAL_WINDOW_DAYS)
+        X, y, employee_ids, latest_outcome = self.collect(since)
+
+        summary = {'mode': self.mode, 'parent_version': version, 'new_labels': int(len(y)), 'promoted': False}
+        holdout = np.array([in_holdout(employee_id, settings.INCREMENTAL_HOLDOUT_FRACTION)
+                            for employee_id in employee_ids], dtype=bool)
+        if len(y) < settings.INCREMENTAL_MIN_LABELS or holdout.all() or not holdout.any():
+            summary['reason'] = f"need at least {settings.INCREMENTAL_MIN_LABELS} labels on both sides of the holdout"
+            logger.info(f"Incremental training skipped: {summary}")
+            return summary
+        if len(np.unique(y[~holdout])) < 2:
+            summary['reason'] = 'training labels contain a single outcome'
+            logger.info(f"Incremental training skipped: {summary}")
+            return summary
+
+        candidate, candidate_scaler = self._train(model, scaler, metadata, X[~holdout], y[~holdout])
+        current_metrics = holdout_metrics(model, scaler, X[holdout], y[holdout])
+        candidate_metrics = holdout_metrics(candidate, candidate_scaler, X[holdout], y[holdout])
+        summary.update({
+            'train_rows': int((~holdout).sum()),
+            'holdout_rows': int(holdout.sum()),
+            'current': current_metrics,
+            'candidate': candidate_metrics,
+            'training_seconds': (datetime.now() - started).total_seconds()
+        })
+
+        # Compare on AUC when the holdout has both outcomes, otherwise on log loss
+        if 'auc' in candidate_metrics:
+            improvement = candidate_metrics['auc'] - current_metrics['auc']
+        else:
+            improvement = current_metrics['log_loss'] - candidate_metrics['log_loss']
+        summary['improvement'] = improvement
+        if improvement <= settings.INCREMENTAL_MIN_IMPROVEMENT:
+            summary['reason'] = 'candidate did not beat the active model on the holdout'
+        elif dry_run:
+            summary['reason'] = 'dry run'
+        else:
+            predictor = MLPredictor()
+            # Publish to the registry the candidate was trained from and gated against
+            predictor.registry = self.registry
+            predictor._set_model(candidate, candidate_scaler, None)
+            predictor.save_model({
+                'source': 'IncrementalTrainer',
+                'mode': self.mode,
+                'parent_version': version,
+                'labels_through': latest_outcome.isoformat(),
+                'new_labels': int(len(y)),
+                'holdout': {'current': current_metrics, 'candidate': candidate_metrics},
+                'hyperparameters': metadata.get('hyperparameters', DEFAULT_HYPERPARAMETERS)
+            }, parity_features=X[holdout])
+            summary.update({'promoted': predictor.model_version is not None, 'version': predictor.model_version})
+
+        logger.info(f"Incremental training: {summary}")
+        return summary
+
+    def _train(self, model, scaler, metadata: Dict, X: np.ndarray, y: np.ndarray):
+        """Candidate (model, scaler) from the active model and the training rows"""
+        import xgboost as xgb
+
+        if self.mode == 'continue':
+            # Trees split on scaled values, so the active scaler must be kept. Boosting
+            # continues from the trees actually served: a sliced booster drops the ones
+            # past best_iteration and the stale attribute that would hide the new trees
+            booster = model.get_booster()
+            best_iteration = booster.attr('best_iteration')
+            if best_iteration is not None:
+                booster = booster[:int(best_iteration) + 1]
+            params = {**model.get_params(), 'n_estimators': settings.INCREMENTAL_BOOST_ROUNDS,
+                      'early_stopping_rounds': None}
+            candidate = xgb.XGBClassifier(**params)
+            candidate.fit(scaler.transform(X), y, xgb_model=booster, verbose=False)
+            return candidate, scaler
+
+        from sklearn.preprocessing import StandardScaler
+
+        window_scaler = StandardScaler().fit(X)
+        hyperparameters = {**DEFAULT_HYPERPARAMETERS, **metadata.get('hyperparameters', {})}
+        candidate = xgb.XGBClassifier(**hyperparameters, objective='binary:logistic', random_state=42)
+        candidate.fit(window_scaler.transform(X), y, verbose=False)
+        return candidate, window_scaler
+
+def main():
+    parser = argparse.ArgumentParser(description='Retrain the active model on newly labeled predictions')
+    parser.add_argument('--mode', choices=['continue', 'window'], help='Default: INCREMENTAL_MODE')
+    parser.add_argument('--dry-run', action='store_true', help='Validate the candidate without promoting it')
+    args = parser.parse_args()
+
+    from app import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        IncrementalTrainer(db, mode=args.mode, feature_store=FeatureStore()).run(dry_run=args.dry_run)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
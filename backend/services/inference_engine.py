@@ -0,0 +1,98 @@
+import logging
+import threading
+from typing import Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+def scaler_params(scaler) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+    """(mean, scale) a fitted StandardScaler applies; None where it skips that step"""
+    mean = getattr(scaler, 'mean_', None) if getattr(scaler, 'with_mean', True) else None
+    scale = getattr(scaler, 'scale_', None) if getattr(scaler, 'with_std', True) else None
+    return (None if mean is None else np.asarray(mean, dtype=np.float64),
+            None if scale is None else np.asarray(scale, dtype=np.float64))
+
+def standard_scale(features: np.ndarray, mean: Optional[np.ndarray], scale: Optional[np.ndarray],
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+    """StandardScaler.transform followed by XGBoost's float32 cast, bit for bit
+
+    Tree splits are exact float32 comparisons against training values, so a
+    1-ulp difference flips splits on discrete features. Like sklearn, this
+    subtracts and divides in float64 (rounding float32 input back after each
+    step, as sklearn's in-place ops do) and rounds to float32 once at the end.
+    """
+    features = np.asarray(features)
+    if features.dtype != np.float32:
+        features = features.astype(np.float64, copy=False)
+    centered = features
+    if mean is not None:
+        centered = (features - mean).astype(features.dtype, copy=False)
+    if out is None:
+        out = np.empty(features.shape, dtype=np.float32)
+    if scale is None:
+        out[...] = centered
+    else:
+        np.divide(centered, scale, out=out, casting='unsafe')
+    return out
+
+class BoosterInferenceEngine:
+    """Low-overhead inference for a StandardScaler + XGBClassifier pair
+
+    Inputs are scaled with standard_scale, which reproduces the sklearn
+    transform exactly, and the raw Booster is called through inplace_predict,
+    skipping the sklearn validation and copies on every call. Each thread gets
+    its own scratch buffer for the scaled matrix, so one engine can serve
+    concurrent requests from the threadpool.
+    """
+
+    def __init__(self, model, scaler):
+        self.booster = model.get_booster()
+        self.iteration_range = self._iteration_range(model)
+        self.mean, self.scale = scaler_params(scaler)
+        self.n_features = model.n_features_in_
+        self._local = threading.local()
+
+    @staticmethod
+    def supports(model, scaler) -> bool:
+        """Whether a model/scaler pair can be served by this engine"""
+        # Checked by name first so other backends (ONNX) never import xgboost or sklearn here
+        if not type(model).__module__.startswith('xgboost.'):
+            return False
+        try:
+            import xgboost as xgb
+            from sklearn.preprocessing import StandardScaler
+        except ImportError:
+            return False
+        return (
+            isinstance(model, xgb.XGBClassifier)
+            and model.objective == 'binary:logistic'
+            and isinstance(scaler, StandardScaler)
+        )
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Positive-class probabilities for an (n, n_features) matrix, as float32"""
+        features = np.asarray(features)
+        n_rows = features.shape[0]
+        scaled = standard_scale(features, self.mean, self.scale, out=self._buffer(n_rows))
+        return self.booster.inplace_predict(
+            scaled,
+            iteration_range=self.iteration_range,
+            validate_features=False
+        )
+
+    def _buffer(self, n_rows: int) -> np.ndarray:
+        """Thread-local float32 scratch matrix with at least n_rows rows"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or buffer.shape[0] < n_rows:
+            buffer = np.empty((max(n_rows, 64), self.n_features), dtype=np.float32)
+            self._local.buffer = buffer
+        return buffer[:n_rows]
+
+    @staticmethod
+    def _iteration_range(model) -> Tuple[int, int]:
+        """Same tree range XGBClassifier.predict_proba uses (best_iteration if early-stopped)"""
+        try:
+            return (0, model.best_iteration + 1)
+        except AttributeError:
+            return (0, 0)
@@ -0,0 +1,138 @@
+import asyncio
+import bisect
+import logging
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128, 256, 512]
+LATENCY_MS_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000]
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative "le" buckets"""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = list(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, value)] += 1
+            self._sum += value
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            counts = list(self._counts)
+            total_sum = self._sum
+        total = sum(counts)
+        cumulative = []
+        running = 0
+        for count in counts:
+            running += count
+            cumulative.append(running)
+        return {
+            'count': total,
+            'sum': total_sum,
+            'mean': total_sum / total if total else 0.0,
+            'buckets': {
+                **{str(bound): cumulative[i] for i, bound in enumerate(self.buckets)},
+                '+Inf': cumulative[-1]
+            },
+            'p50': self._quantile(cumulative, 0.5),
+            'p99': self._quantile(cumulative, 0.99)
+        }
+
+    def _quantile(self, cumulative: List[int], q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-quantile"""
+        total = cumulative[-1]
+        if not total:
+            return None
+        rank = q * total
+        for i, count in enumerate(cumulative[:-1]):
+            if count >= rank:
+                return self.buckets[i]
+        return float('inf')
+
+class MicroBatcher:
+    """Coalesce concurrent single predictions into one vectorized batch
+
+    Each submit() queues a payload and awaits a future. The queue is flushed
+    when it reaches max_batch_size or window_ms after its first item arrived,
+    whichever comes first; the batch runs in the threadpool and every caller's
+    future is resolved with its own row.
+    """
+
+    def __init__(self, predict_batch: Callable[[List[Dict]], List[Tuple[float, Dict]]],
+                 window_ms: Optional[float] = None, max_batch_size: Optional[int] = None):
+        self.predict_batch = predict_batch
+        self.window_ms = settings.MICRO_BATCH_WINDOW_MS if window_ms is None else window_ms
+        self.max_batch_size = max_batch_size or settings.MICRO_BATCH_MAX_SIZE
+        self._pending: List[Tuple[Dict, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running = set()
+        self.batch_sizes = Histogram(BATCH_SIZE_BUCKETS)
+        self.queue_wait_ms = Histogram(LATENCY_MS_BUCKETS)
+        self.batch_latency_ms = Histogram(LATENCY_MS_BUCKETS)
+
+    async def submit(self, employee_data: Dict) -> Tuple[float, Dict]:
+        """Queue one employee and wait for its prediction"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((employee_data, future, time.perf_counter()))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_ms / 1000, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending[:self.max_batch_size], self._pending[self.max_batch_size:]
+        if self._pending:
+            self._timer = asyncio.get_running_loop().call_later(self.window_ms / 1000, self._flush)
+        if batch:
+            task = asyncio.create_task(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Dict, asyncio.Future, float]]):
+        started = time.perf_counter()
+        self.batch_sizes.observe(len(batch))
+        for _, _, enqueued_at in batch:
+            self.queue_wait_ms.observe((started - enqueued_at) * 1000)
+
+        try:
+            results = await run_in_threadpool(self.predict_batch, [payload for payload, _, _ in batch])
+        except Exception as e:
+            logger.error(f"Micro-batch of {len(batch)} failed: {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self.batch_latency_ms.observe((time.perf_counter() - started) * 1000)
+
+        for (_, future, _), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict:
+        return {
+            'window_ms': self.window_ms,
+            'max_batch_size': self.max_batch_size,
+            'queued': len(self._pending),
+            'batch_size': self.batch_sizes.snapshot(),
+            'queue_wait_ms': self.queue_wait_ms.snapshot(),
+            'batch_latency_ms': self.batch_latency_ms.snapshot()
+        }
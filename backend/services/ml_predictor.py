@@ -1,44 +1,80 @@
 import numpy as np
-import pandas as pd
-import xgboost as xgb
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-import joblib
 import logging
-from typing import Dict, Tuple, List, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Tuple, List, Optional
 from datetime import datetime
 import os
 import json
 
-from services.feature_extractor import FeatureExtractor
+from services.feature_extractor import FEATURE_NAMES, FeatureExtractor
+from services.model_registry import ModelRegistry
+from services.inference_engine import BoosterInferenceEngine
+from services.explainer import RiskExplainer
+from services.onnx_backend import OnnxRetentionModel, export_onnx, verify_parity
+from services.risk_rules import (
+    FALLBACK_RULES, evaluate_fallback, evaluate_risk_factors,
+    generate_interventions, interventions_batch, match_fallback, match_risk_factors, risk_factor_dicts
+)
 from config import settings
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 logger = logging.getLogger(__name__)
 
+# model_version recorded for predictions served by the rule-based fallback
+RULE_BASED_VERSION = 'rule-based'
+
+# XGBoost hyperparameters used unless train_model is given tuned ones
+DEFAULT_HYPERPARAMETERS = {
+    'n_estimators': 100,
+    'max_depth': 6,
+    'learning_rate': 0.1
+}
+
 class MLPredictor:
     def __init__(self):
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = None
+        self.engine = None
+        self.explainer = None
         self.feature_extractor = FeatureExtractor()
         self.model_path = settings.MODEL_PATH
         self.threshold = settings.PREDICTION_THRESHOLD
+        self.batch_size = settings.PREDICTION_BATCH_SIZE
+        self.registry = ModelRegistry()
+        self.model_version = None
+        self.cache = None  # Optional PredictionCache shared by the PredictorService
         
-    def load_model(self) -> bool:
-        """Load trained model from disk or train a new one"""
+    def load_model(self, progress: Optional[Callable[[str], None]] = None) -> bool:
+        """Load the active registry model, a legacy pickle, or train a new one
+        
+        progress, if given, is called with the name of each phase as it starts.
+        """
+        progress = progress or (lambda phase: None)
         try:
+            if self.registry.active_version():
+                progress('loading_registry_model')
+                return self.load_version()
+            
             model_dir = os.path.dirname(self.model_path)
             if not os.path.exists(model_dir):
                 os.makedirs(model_dir)
             
             if os.path.exists(self.model_path):
+                import joblib
+                
+                progress('loading_legacy_model')
                 logger.info(f"Loading model from {self.model_path}")
                 model_data = joblib.load(self.model_path)
-                self.model = model_data['model']
-                self.scaler = model_data['scaler']
+                self._set_model(
+                    model_data['model'],
+                    model_data['scaler'],
+                    f"legacy-{model_data.get('timestamp', 'unknown')}"
+                )
                 return True
             else:
                 logger.info("No trained model found. Training new model...")
-                return self.train_model()
+                return self.train_model(progress=progress)
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             # Fall back to demo model
@@ -46,11 +82,52 @@ class MLPredictor:
             self.model = self._create_demo_model()
             return True
     
-    def train_model(self, training_data: Optional[pd.DataFrame] = None) -> bool:
+    def load_version(self, version: Optional[str] = None) -> bool:
+        """Load a registry version (the active one by default); raises on failure"""
+        version = version or self.registry.active_version()
+        onnx_path = self.registry.onnx_path(version) if version else None
+        if settings.INFERENCE_BACKEND == 'onnx' and onnx_path and os.path.exists(onnx_path):
+            # Serve from ONNX without unpickling (and importing) xgboost/sklearn
+            logger.info(f"Loading ONNX model version {version}")
+            self._set_model(OnnxRetentionModel(onnx_path), None, version)
+            return True
+        
+        version, model_data = self.registry.load(version)
+        logger.info(f"Loading model version {version}")
+        self._set_model(model_data['model'], model_data['scaler'], version)
+        return True
+    
+    def _set_model(self, model, scaler, version: Optional[str]):
+        """Install a model/scaler pair and build its inference engine"""
+        self.model = model
+        self.scaler = scaler
+        self.model_version = version
+        self._build_engine()
+    
+    def _build_engine(self):
+        """Pick the inference engine for the installed model"""
+        self.engine = None
+        if isinstance(self.model, OnnxRetentionModel):
+            self.engine = self.model
+        elif settings.INFERENCE_BACKEND == 'booster' and BoosterInferenceEngine.supports(self.model, self.scaler):
+            self.engine = BoosterInferenceEngine(self.model, self.scaler)
+        self.explainer = None
+        if not isinstance(self.model, OnnxRetentionModel) and RiskExplainer.supports(self.model, self.scaler):
+            self.explainer = RiskExplainer(self.model, self.scaler, self.model_version)
+    
+    def train_model(self, training_data: Optional['pd.DataFrame'] = None,
+                    progress: Optional[Callable[[str], None]] = None,
+                    hyperparameters: Optional[Dict] = None, metadata: Optional[Dict] = None) -> bool:
         """Train a new retention prediction model"""
+        import xgboost as xgb
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        
+        progress = progress or (lambda phase: None)
         try:
             if training_data is None:
                 # Generate synthetic training data for demo
+                progress('generating_training_data')
                 training_data = self._generate_synthetic_data()
             
             # Prepare features and labels
@@ -63,14 +140,15 @@ class MLPredictor:
             )
             
             # Scale features
+            self.scaler = StandardScaler()
             X_train_scaled = self.scaler.fit_transform(X_train)
             X_test_scaled = self.scaler.transform(X_test)
             
             # Train XGBoost model
+            progress('training_model')
+            hyperparameters = {**DEFAULT_HYPERPARAMETERS, **(hyperparameters or {})}
             self.model = xgb.XGBClassifier(
-                n_estimators=100,
-                max_depth=6,
-                learning_rate=0.1,
+                **hyperparameters,
                 objective='binary:logistic',
                 random_state=42
             )
@@ -82,14 +160,22 @@ class MLPredictor:
                 early_stopping_rounds=10,
                 verbose=False
             )
-            
-            # Save model
-            self.save_model()
+            self._build_engine()
             
             # Log performance
             accuracy = self.model.score(X_test_scaled, y_test)
             logger.info(f"Model trained with accuracy: {accuracy:.2%}")
             
+            # Save model
+            progress('publishing_model')
+            self.save_model({
+                'accuracy': float(accuracy),
+                'n_samples': len(training_data),
+                'source': 'MLPredictor.train_model',
+                'hyperparameters': hyperparameters,
+                **(metadata or {})
+            }, parity_features=np.asarray(X_test, dtype=np.float64))
+            
             return True
             
         except Exception as e:
@@ -107,11 +193,16 @@ class MLPredictor:
                 # Fallback to rule-based prediction
                 return self._rule_based_prediction(employee_data)
             
-            # Scale features
-            features_scaled = self.scaler.transform([features])
+            cache_key = None
+            if self.cache is not None:
+                cache_key = self.cache.make_key(features, self.model_version,
+                                                self.feature_extractor.rule_input_row(employee_data))
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return cached
             
-            # Get prediction and probability
-            probability = self.model.predict_proba(features_scaled)[0][1]
+            # Scale features and get probability
+            probability = self._predict_proba(features[np.newaxis, :])[0]
             
             # Determine risk level
             risk_level = self._categorize_risk(probability)
@@ -122,13 +213,18 @@ class MLPredictor:
             # Generate interventions
             interventions = self._generate_interventions(risk_factors, probability)
             
-            return probability, {
+            prediction = probability, {
                 'confidence': self._calculate_confidence(features),
                 'risk_level': risk_level,
                 'risk_factors': risk_factors,
                 'departure_window': self._estimate_departure_window(probability),
-                'suggested_interventions': interventions
+                'suggested_interventions': interventions,
+                'drivers': self._explain(features[np.newaxis, :])[0],
+                'model_version': self.model_version
             }
+            if cache_key is not None:
+                self.cache.put(cache_key, prediction, employee_data.get('employee_id'))
+            return prediction
             
         except Exception as e:
             logger.error(f"Prediction error: {e}")
@@ -136,49 +232,39 @@ class MLPredictor:
     
     def _rule_based_prediction(self, employee_data: Dict) -> Tuple[float, Dict]:
         """Fallback rule-based prediction when ML model unavailable"""
-        risk_score = 0.0
-        risk_factors = {}
-        
-        # Check communication decline
-        slack = employee_data.get('slack_metrics', {})
-        if slack.get('participation_trend') == 'declining':
-            risk_score += 0.3
-            risk_factors['declining_communication'] = 'high'
-        
-        # Check sentiment
-        sentiment = slack.get('sentiment_score', 0)
-        if sentiment < -0.2:
-            risk_score += 0.2
-            risk_factors['negative_sentiment'] = 'high'
-        
-        # Check after-hours activity (burnout indicator)
-        after_hours = slack.get('after_hours_messages', 0)
-        if after_hours > 30:
-            risk_score += 0.2
-            risk_factors['burnout_risk'] = 'high'
-        
-        # Check meeting participation
-        calendar = employee_data.get('calendar_metrics', {})
-        if calendar.get('meetings_declined', 0) > 30:
-            risk_score += 0.15
-            risk_factors['disengagement'] = 'medium'
-        
-        # Check productivity
-        productivity = employee_data.get('productivity_metrics', {})
-        if productivity.get('performance_trend') == 'declining':
-            risk_score += 0.15
-            risk_factors['performance_decline'] = 'medium'
-        
-        risk_score = min(risk_score, 0.95)
+        values = self.feature_extractor.rule_input_row(employee_data)
+        risk_score, risk_factors = match_fallback(values)
         
         return risk_score, {
             'confidence': 0.65,  # Lower confidence for rule-based
             'risk_level': self._categorize_risk(risk_score),
             'risk_factors': risk_factors,
             'departure_window': self._estimate_departure_window(risk_score),
-            'suggested_interventions': self._generate_interventions(risk_factors, risk_score)
+            'suggested_interventions': self._generate_interventions(risk_factors, risk_score),
+            'drivers': [],
+            'model_version': RULE_BASED_VERSION
         }
     
+    def _rule_based_batch(self, rule_inputs: np.ndarray) -> List[Tuple[float, Dict]]:
+        """Rule-based predictions for a whole rule-input matrix (see risk_rules.FALLBACK_RULES)"""
+        scores, codes = evaluate_fallback(rule_inputs)
+        risk_factors = risk_factor_dicts(codes, FALLBACK_RULES)
+        interventions = interventions_batch(codes, scores, FALLBACK_RULES)
+        risk_levels = self._categorize_risk_batch(scores)
+        departure_windows = self._estimate_departure_window_batch(scores)
+        
+        return [(risk_score, {
+            'confidence': 0.65,  # Lower confidence for rule-based
+            'risk_level': risk_level,
+            'risk_factors': factors,
+            'departure_window': departure_window,
+            'suggested_interventions': actions,
+            'drivers': [],
+            'model_version': RULE_BASED_VERSION
+        }) for risk_score, risk_level, factors, departure_window, actions in zip(
+            scores.tolist(), risk_levels, risk_factors, departure_windows, interventions
+        )]
+    
     def _categorize_risk(self, probability: float) -> str:
         """Categorize risk level based on probability"""
         if probability >= 0.75:
@@ -191,39 +277,8 @@ class MLPredictor:
             return 'low'
     
     def _identify_risk_factors(self, employee_data: Dict, features: np.ndarray) -> Dict:
-        """Identify top risk factors from data"""
-        risk_factors = {}
-        
-        # Communication factors
-        slack = employee_data.get('slack_metrics', {})
-        if slack.get('participation_trend') == 'declining':
-            risk_factors['declining_communication'] = 'high'
-        elif slack.get('message_count', 0) < 10:
-            risk_factors['low_engagement'] = 'medium'
-        
-        # Sentiment analysis
-        if slack.get('sentiment_score', 0) < -0.1:
-            risk_factors['negative_sentiment'] = 'high'
-        
-        # Work-life balance
-        if slack.get('after_hours_messages', 0) > 25:
-            risk_factors['burnout_risk'] = 'high'
-        
-        # Meeting engagement
-        calendar = employee_data.get('calendar_metrics', {})
-        if calendar.get('meetings_declined', 0) > 20:
-            risk_factors['meeting_avoidance'] = 'medium'
-        
-        # Performance
-        productivity = employee_data.get('productivity_metrics', {})
-        if productivity.get('performance_trend') == 'declining':
-            risk_factors['performance_decline'] = 'high'
-        
-        # Workload
-        if productivity.get('workload_balance', 0) < 0.3:
-            risk_factors['workload_imbalance'] = 'high'
-        
-        return risk_factors
+        """Identify top risk factors from data (see risk_rules.RISK_FACTOR_RULES)"""
+        return match_risk_factors(self.feature_extractor.rule_input_row(employee_data))
     
     def _estimate_departure_window(self, probability: float) -> str:
         """Estimate likely departure timeframe"""
@@ -238,71 +293,7 @@ class MLPredictor:
     
     def _generate_interventions(self, risk_factors: Dict, probability: float) -> List[Dict]:
         """Generate recommended interventions based on risk factors"""
-        interventions = []
-        
-        if 'declining_communication' in risk_factors:
-            interventions.append({
-                'action': 'Schedule 1:1 Check-in',
-                'description': 'Have a direct conversation about engagement and any concerns',
-                'priority': 'high',
-                'timeline': 'within 3 days',
-                'owner': 'Direct Manager'
-            })
-        
-        if 'burnout_risk' in risk_factors:
-            interventions.append({
-                'action': 'Workload Review',
-                'description': 'Review current workload and consider redistribution or support',
-                'priority': 'high',
-                'timeline': 'within 1 week',
-                'owner': 'Manager + HR'
-            })
-            interventions.append({
-                'action': 'Promote Work-Life Balance',
-                'description': 'Encourage time off and establish after-hours boundaries',
-                'priority': 'medium',
-                'timeline': 'immediate',
-                'owner': 'Manager'
-            })
-        
-        if 'negative_sentiment' in risk_factors:
-            interventions.append({
-                'action': 'Employee Wellness Check',
-                'description': 'HR to conduct confidential wellness conversation',
-                'priority': 'high',
-                'timeline': 'within 3 days',
-                'owner': 'HR Partner'
-            })
-        
-        if 'performance_decline' in risk_factors:
-            interventions.append({
-                'action': 'Performance Support Plan',
-                'description': 'Identify skill gaps and provide training/mentoring',
-                'priority': 'medium',
-                'timeline': 'within 2 weeks',
-                'owner': 'Manager'
-            })
-        
-        if 'meeting_avoidance' in risk_factors:
-            interventions.append({
-                'action': 'Meeting Optimization',
-                'description': 'Review meeting necessity and employee involvement',
-                'priority': 'low',
-                'timeline': 'within 2 weeks',
-                'owner': 'Manager'
-            })
-        
-        if probability > 0.7 and not interventions:
-            interventions.append({
-                'action': 'Retention Discussion',
-                'description': 'Discuss career goals, compensation, and growth opportunities',
-                'priority': 'critical',
-                'timeline': 'immediately',
-                'owner': 'Manager + HR'
-            })
-        
-        return sorted(interventions, key=lambda x: 
-                     {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}[x['priority']])
+        return generate_interventions(risk_factors, probability)
     
     def _calculate_confidence(self, features: np.ndarray) -> float:
         """Calculate prediction confidence based on feature completeness"""
@@ -319,63 +310,187 @@ class MLPredictor:
         # This is a placeholder - in production, you'd have a real model
         return None
     
-    def _generate_synthetic_data(self, n_samples: int = 1000) -> pd.DataFrame:
+    def _generate_synthetic_data(self, n_samples: int = 1000, seed: int = 42) -> 'pd.DataFrame':
         """Generate synthetic training data for demo purposes"""
-        np.random.seed(42)
+        import pandas as pd
         
-        data = []
-        for i in range(n_samples):
-            # Generate features
-            tenure = np.random.uniform(0.5, 10)
-            sentiment = np.random.uniform(-1, 1)
-            engagement = np.random.uniform(0, 1)
-            burnout = np.random.uniform(0, 1)
-            performance = np.random.uniform(0, 1)
-            
-            # Create departure label based on features
-            departure_probability = (
-                (1 - tenure/10) * 0.3 +  # Newer employees more likely to leave
-                (1 - sentiment) * 0.2 +   # Negative sentiment increases risk
-                (1 - engagement) * 0.2 +  # Low engagement increases risk
-                burnout * 0.2 +           # High burnout increases risk
-                (1 - performance) * 0.1   # Low performance increases risk
-            )
-            
-            departed = np.random.random() < departure_probability
-            
-            # Create full feature vector (matching FeatureExtractor output)
-            features = np.random.randn(34)  # 34 features from FeatureExtractor
-            features[0] = tenure
-            features[6] = sentiment
-            features[31] = engagement
-            features[32] = burnout
-            features[27] = performance
-            
-            row = {'employee_id': f'EMP{i:04d}', 'departed': int(departed)}
-            for j, val in enumerate(features):
-                row[f'feature_{j}'] = val
-            
-            data.append(row)
+        rng = np.random.default_rng(seed)
         
-        return pd.DataFrame(data)
+        # Full feature matrix (matching FeatureExtractor output), drawn column-wise
+        features = rng.standard_normal((n_samples, len(FEATURE_NAMES)))
+        tenure = features[:, 0] = rng.uniform(0.5, 10, n_samples)
+        sentiment = features[:, 6] = rng.uniform(-1, 1, n_samples)
+        engagement = features[:, 31] = rng.uniform(0, 1, n_samples)
+        burnout = features[:, 32] = rng.uniform(0, 1, n_samples)
+        performance = features[:, 27] = rng.uniform(0, 1, n_samples)
+        
+        # Create departure label based on features
+        departure_probability = (
+            (1 - tenure/10) * 0.3 +  # Newer employees more likely to leave
+            (1 - sentiment) * 0.2 +   # Negative sentiment increases risk
+            (1 - engagement) * 0.2 +  # Low engagement increases risk
+            burnout * 0.2 +           # High burnout increases risk
+            (1 - performance) * 0.1   # Low performance increases risk
+        )
+        departed = rng.random(n_samples) < departure_probability
+        
+        df = pd.DataFrame(features, columns=[f'feature_{j}' for j in range(features.shape[1])])
+        df.insert(0, 'departed', departed.astype(int))
+        df.insert(0, 'employee_id', [f'EMP{i:04d}' for i in range(n_samples)])
+        return df
     
-    def save_model(self):
-        """Save model and scaler to disk"""
+    def save_model(self, metadata: Optional[Dict] = None, parity_features: Optional[np.ndarray] = None):
+        """Publish model and scaler (plus an ONNX export) as a new active registry version
+        
+        parity_features are raw held-out rows the ONNX export must reproduce.
+        """
         try:
             model_data = {
                 'model': self.model,
                 'scaler': self.scaler,
                 'timestamp': datetime.now().isoformat()
             }
-            joblib.dump(model_data, self.model_path)
-            logger.info(f"Model saved to {self.model_path}")
+            version = self.registry.publish(model_data, metadata, activate=False)
+            if settings.ONNX_EXPORT:
+                self._export_onnx(version, parity_features)
+            self.registry.activate(version)
+            self.model_version = version
+            if self.explainer is not None:
+                self.explainer.model_version = version
+            logger.info(f"Model saved as version {self.model_version}")
         except Exception as e:
             logger.error(f"Error saving model: {e}")
     
-    def batch_predict(self, employees_data: List[Dict]) -> List[Tuple[float, Dict]]:
-        """Predict for multiple employees"""
-        predictions = []
-        for employee_data in employees_data:
-            prediction = self.predict(employee_data)
-            predictions.append(prediction)
-        return predictions
\ No newline at end of file
+    def _export_onnx(self, version: str, parity_features: Optional[np.ndarray] = None):
+        """Export a registry version to ONNX, keeping it only if it matches the original"""
+        onnx_path = self.registry.onnx_path(version)
+        try:
+            export_onnx(self.model, self.scaler, onnx_path)
+            max_diff = verify_parity(self.model, self.scaler, onnx_path, parity_features)
+            self.registry.update_metadata(version, {'onnx_artifact': os.path.basename(onnx_path),
+                                                    'onnx_max_diff': max_diff})
+        except Exception as e:
+            logger.warning(f"ONNX export skipped for {version}: {e}")
+            if os.path.exists(onnx_path):
+                os.remove(onnx_path)
+    
+    def batch_predict(self, employees_data: List[Dict], batch_size: Optional[int] = None,
+                      use_cache: bool = False) -> List[Tuple[float, Dict]]:
+        """Predict for multiple employees over a single feature matrix
+        
+        With use_cache, rows already in the attached PredictionCache are served
+        from it and only the remaining rows are scored (interactive micro-batches);
+        bulk rescoring leaves it off so it does not flush the cache.
+        """
+        if not employees_data:
+            return []
+        
+        if self.model is None:
+            return self._rule_based_batch(self.feature_extractor.extract_rule_inputs(employees_data))
+        
+        try:
+            # Build one (n, 34) matrix and score it in chunks
+            features, _ = self.feature_extractor.extract_batch(employees_data, dtype=np.float64)
+            rule_inputs = self.feature_extractor.extract_rule_inputs(employees_data)
+            
+            predictions = [None] * len(employees_data)
+            cache_keys = None
+            if use_cache and self.cache is not None:
+                cache_keys = [self.cache.make_key(row, self.model_version, rule_row)
+                              for row, rule_row in zip(features, rule_inputs)]
+                predictions = [self.cache.get(key) for key in cache_keys]
+            
+            pending = [i for i, prediction in enumerate(predictions) if prediction is None]
+            if not pending:
+                return predictions
+            if len(pending) < len(features):
+                features, rule_inputs = features[pending], rule_inputs[pending]
+            scored = self.score_matrix(features, rule_inputs, batch_size)
+        except Exception as e:
+            logger.error(f"Batch prediction error: {e}")
+            return [self.predict(employee_data) for employee_data in employees_data]
+        
+        for i, prediction in zip(pending, scored):
+            predictions[i] = prediction
+            if cache_keys is not None:
+                self.cache.put(cache_keys[i], prediction, employees_data[i].get('employee_id'))
+        return predictions
+    
+    def score_matrix(self, features: np.ndarray, rule_inputs: np.ndarray,
+                     batch_size: Optional[int] = None) -> List[Tuple[float, Dict]]:
+        """Predict from prebuilt feature and rule-input matrices (see FeatureExtractor.extract_rule_inputs)
+        
+        Produces the same results as batch_predict on the payloads the matrices
+        were built from, without needing the payload dicts themselves.
+        """
+        if self.model is None:
+            return self._rule_based_batch(rule_inputs)
+        
+        probabilities = self._predict_proba_batch(features, batch_size)
+        risk_levels = self._categorize_risk_batch(probabilities)
+        departure_windows = self._estimate_departure_window_batch(probabilities)
+        confidences = self._calculate_confidence_batch(features)
+        codes = evaluate_risk_factors(rule_inputs)
+        risk_factors = risk_factor_dicts(codes)
+        interventions = interventions_batch(codes, probabilities)
+        drivers = self._explain(features)
+        
+        return [(probability, {
+            'confidence': confidence,
+            'risk_level': risk_level,
+            'risk_factors': factors,
+            'departure_window': departure_window,
+            'suggested_interventions': actions,
+            'drivers': row_drivers,
+            'model_version': self.model_version
+        }) for probability, confidence, risk_level, factors, departure_window, actions, row_drivers in zip(
+            probabilities, confidences, risk_levels, risk_factors, departure_windows, interventions, drivers
+        )]
+    
+    def _explain(self, features: np.ndarray) -> List[List[Dict]]:
+        """Top model drivers per row, or empty lists when the model can't be explained"""
+        if self.explainer is None:
+            return [[] for _ in range(len(features))]
+        try:
+            return self.explainer.explain(features)
+        except Exception as e:
+            logger.warning(f"Explanation failed: {e}")
+            return [[] for _ in range(len(features))]
+    
+    def _predict_proba_batch(self, features: np.ndarray, batch_size: Optional[int] = None) -> np.ndarray:
+        """Scale and score a feature matrix, one predict_proba call per chunk"""
+        batch_size = batch_size or self.batch_size
+        probabilities = np.empty(len(features), dtype=np.float32)
+        for start in range(0, len(features), batch_size):
+            probabilities[start:start + batch_size] = self._predict_proba(features[start:start + batch_size])
+        return probabilities
+    
+    def _predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Positive-class probabilities for a raw (unscaled) feature matrix"""
+        if self.engine is not None:
+            return self.engine.predict_proba(features)
+        return self.model.predict_proba(self.scaler.transform(features))[:, 1]
+    
+    def _categorize_risk_batch(self, probabilities: np.ndarray) -> np.ndarray:
+        """Vectorized _categorize_risk"""
+        # Compare in float64 so boundaries match the scalar path exactly
+        p = np.asarray(probabilities, dtype=np.float64)
+        return np.select(
+            [p >= 0.75, p >= 0.5, p >= 0.25],
+            ['critical', 'high', 'medium'],
+            default='low'
+        ).astype(object)
+    
+    def _estimate_departure_window_batch(self, probabilities: np.ndarray) -> np.ndarray:
+        """Vectorized _estimate_departure_window"""
+        p = np.asarray(probabilities, dtype=np.float64)
+        return np.select(
+            [p >= 0.8, p >= 0.6, p >= 0.4],
+            ['0-30 days', '30-60 days', '60-90 days'],
+            default='Low immediate risk'
+        ).astype(object)
+    
+    def _calculate_confidence_batch(self, features: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_confidence over a feature matrix"""
+        data_completeness = np.count_nonzero(features, axis=1) / features.shape[1]
+        return np.minimum(0.5 + (data_completeness * 0.45), 0.95)
@@ -0,0 +1,136 @@
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+ARTIFACT_FILE = 'model.joblib'
+ONNX_FILE = 'model.onnx'
+METADATA_FILE = 'metadata.json'
+
+class ModelRegistry:
+    """Directory of versioned model artifacts described by a JSON manifest
+
+    Layout:
+        <root>/manifest.json              {"active": version, "versions": {version: metadata}}
+        <root>/<version>/model.joblib     {'model', 'scaler', 'timestamp'}
+        <root>/<version>/model.onnx       optional ONNX export of the same pipeline
+        <root>/<version>/metadata.json    training metadata for that version
+
+    The manifest is always rewritten atomically, so readers never observe a
+    half-written file and activating a version is a single rename.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.MODEL_REGISTRY_DIR
+
+    def read_manifest(self) -> Dict:
+        """Read the manifest, or an empty one if the registry is new"""
+        path = os.path.join(self.root, MANIFEST_FILE)
+        if not os.path.exists(path):
+            return {'active': None, 'versions': {}}
+        with open(path) as f:
+            return json.load(f)
+
+    def manifest_mtime(self) -> float:
+        """Modification time of the manifest (0 if missing), used by the watcher"""
+        try:
+            return os.path.getmtime(os.path.join(self.root, MANIFEST_FILE))
+        except OSError:
+            return 0.0
+
+    def active_version(self) -> Optional[str]:
+        return self.read_manifest().get('active')
+
+    def list_versions(self) -> List[Dict]:
+        """All registered versions, newest first"""
+        manifest = self.read_manifest()
+        versions = [
+            {'version': version, 'active': version == manifest.get('active'), **metadata}
+            for version, metadata in manifest.get('versions', {}).items()
+        ]
+        return sorted(versions, key=lambda v: v.get('created_at', ''), reverse=True)
+
+    def version_dir(self, version: str) -> str:
+        return os.path.join(self.root, version)
+
+    def artifact_path(self, version: str) -> str:
+        return os.path.join(self.version_dir(version), ARTIFACT_FILE)
+
+    def onnx_path(self, version: str) -> str:
+        return os.path.join(self.version_dir(version), ONNX_FILE)
+
+    def publish(self, model_data: Dict, metadata: Optional[Dict] = None, activate: bool = True) -> str:
+        """Write a new versioned artifact and register it in the manifest"""
+        version = self._new_version()
+        version_dir = self.version_dir(version)
+        os.makedirs(version_dir)
+
+        metadata = dict(metadata or {})
+        metadata.setdefault('created_at', datetime.now().isoformat())
+        metadata['artifact'] = ARTIFACT_FILE
+
+        import joblib
+
+        joblib.dump(model_data, self.artifact_path(version))
+        self._write_json(os.path.join(version_dir, METADATA_FILE), metadata)
+
+        manifest = self.read_manifest()
+        manifest.setdefault('versions', {})[version] = metadata
+        if activate:
+            manifest['active'] = version
+        self._write_manifest(manifest)
+
+        logger.info(f"Published model version {version} (active: {manifest['active']})")
+        return version
+
+    def activate(self, version: str):
+        """Mark a registered version as the one every worker should serve"""
+        manifest = self.read_manifest()
+        if version not in manifest.get('versions', {}):
+            raise KeyError(f"Unknown model version: {version}")
+        manifest['active'] = version
+        self._write_manifest(manifest)
+        logger.info(f"Activated model version {version}")
+
+    def update_metadata(self, version: str, updates: Dict):
+        """Merge extra keys into a version's metadata"""
+        manifest = self.read_manifest()
+        if version not in manifest.get('versions', {}):
+            raise KeyError(f"Unknown model version: {version}")
+        manifest['versions'][version].update(updates)
+        self._write_json(os.path.join(self.version_dir(version), METADATA_FILE), manifest['versions'][version])
+        self._write_manifest(manifest)
+
+    def load(self, version: Optional[str] = None) -> Tuple[str, Dict]:
+        """Load an artifact (the active one by default), returning (version, model_data)"""
+        version = version or self.active_version()
+        if not version:
+            raise FileNotFoundError(f"No active model in registry {self.root}")
+        import joblib
+
+        return version, joblib.load(self.artifact_path(version))
+
+    def _new_version(self) -> str:
+        base = datetime.now().strftime('v%Y%m%d-%H%M%S')
+        version = base
+        suffix = 1
+        while os.path.exists(self.version_dir(version)):
+            version = f"{base}-{suffix}"
+            suffix += 1
+        return version
+
+    def _write_manifest(self, manifest: Dict):
+        self._write_json(os.path.join(self.root, MANIFEST_FILE), manifest)
+
+    def _write_json(self, path: str, data: Dict):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2, default=str)
+        os.replace(tmp_path, path)
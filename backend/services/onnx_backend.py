@@ -0,0 +1,149 @@
+"""
+ONNX export and onnxruntime serving for the retention model
+
+Export (training side) needs skl2onnx and onnxmltools; serving only needs
+numpy and onnxruntime, so API workers configured with INFERENCE_BACKEND=onnx
+never import xgboost or sklearn.
+
+The graph holds the classifier only. The scaler's mean and scale are stored
+in the model metadata and applied with standard_scale before the session
+runs: a float32 graph cannot reproduce sklearn's float64 scaling, and tree
+splits on discrete features flip on a 1-ulp difference.
+
+Convert a pickle written by ml/train_model.py from the backend directory with:
+
+    python -m services.onnx_backend models/retention_model.pkl models/retention_model.onnx
+"""
+
+import argparse
+import json
+import logging
+from typing import Optional
+
+import numpy as np
+
+from config import settings
+from services.inference_engine import scaler_params, standard_scale
+
+logger = logging.getLogger(__name__)
+
+INPUT_NAME = 'features'
+PROBABILITY_OUTPUT = 'probabilities'
+SCALER_METADATA_KEY = 'standard_scaler'  # JSON {"mean": [...] or null, "scale": [...] or null}
+
+class OnnxRetentionModel:
+    """onnxruntime session for an exported scaler + classifier pipeline
+
+    Exposes the same predict_proba(features) -> positive-class probabilities
+    interface as BoosterInferenceEngine so MLPredictor can use either.
+    """
+
+    def __init__(self, path: str, intra_op_threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = intra_op_threads or settings.ONNX_INTRA_OP_THREADS
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.path = path
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        # Exports without scaler metadata have the scaler inside the graph
+        scaler = self.session.get_modelmeta().custom_metadata_map.get(SCALER_METADATA_KEY)
+        self.scaler = json.loads(scaler) if scaler else None
+        if self.scaler is not None:
+            self.mean, self.scale = (None if self.scaler[key] is None else np.array(self.scaler[key], dtype=np.float64)
+                                     for key in ('mean', 'scale'))
+
+    def predict_proba(self, features: np.ndarray) -> np.ndarray:
+        """Positive-class probabilities for a raw (unscaled) feature matrix, as float32"""
+        if self.scaler is not None:
+            features = standard_scale(features, self.mean, self.scale)
+        else:
+            features = np.ascontiguousarray(features, dtype=np.float32)
+        probabilities = self.session.run([PROBABILITY_OUTPUT], {INPUT_NAME: features})[0]
+        return probabilities[:, 1]
+
+def export_onnx(model, scaler, path: str, n_features: int = 34) -> str:
+    """Export a fitted classifier to ONNX, with the scaler's parameters in its metadata"""
+    from skl2onnx import convert_sklearn
+    from skl2onnx.common.data_types import FloatTensorType
+
+    _register_xgboost_converter()
+    onnx_model = convert_sklearn(
+        model,
+        'retention_model',
+        initial_types=[(INPUT_NAME, FloatTensorType([None, n_features]))],
+        options={id(model): {'zipmap': False}},
+        target_opset={'': 15, 'ai.onnx.ml': 3}
+    )
+    mean, scale = scaler_params(scaler)
+    entry = onnx_model.metadata_props.add()
+    entry.key = SCALER_METADATA_KEY
+    entry.value = json.dumps({'mean': None if mean is None else mean.tolist(),
+                              'scale': None if scale is None else scale.tolist()})
+    with open(path, 'wb') as f:
+        f.write(onnx_model.SerializeToString())
+    logger.info(f"Exported ONNX model to {path}")
+    return path
+
+def verify_parity(model, scaler, path: str, features: Optional[np.ndarray] = None, n_rows: int = 2000,
+                  tolerance: Optional[float] = None, seed: int = 42) -> float:
+    """Compare ONNX and sklearn probabilities; raise if they diverge
+
+    Pass real rows (e.g. a held-out slice of the training data) as features;
+    they hit the split cut points that synthetic rows miss. Without them,
+    parity_rows stands in.
+    """
+    tolerance = settings.ONNX_PARITY_TOLERANCE if tolerance is None else tolerance
+    if features is None:
+        features = parity_rows(scaler, n_rows, seed)
+    features = np.asarray(features, dtype=np.float64)
+
+    expected = model.predict_proba(scaler.transform(features))[:, 1]
+    actual = OnnxRetentionModel(path).predict_proba(features)
+    max_diff = float(np.max(np.abs(expected - actual)))
+    if max_diff > tolerance:
+        raise ValueError(f"ONNX model diverges from the original (max diff {max_diff:.2e} > {tolerance:.0e})")
+    return max_diff
+
+def parity_rows(scaler, n_rows: int = 2000, seed: int = 42) -> np.ndarray:
+    """Gaussian rows around the training distribution plus discrete-valued ones
+
+    Half the rows are rounded to one decimal, like department codes, levels
+    and counts, so repeated values land exactly on split cut points.
+    """
+    rng = np.random.default_rng(seed)
+    features = scaler.mean_ + scaler.scale_ * rng.standard_normal((n_rows, len(scaler.mean_)))
+    features[n_rows // 2:] = np.round(features[n_rows // 2:], 1)
+    return features
+
+def _register_xgboost_converter():
+    """Teach skl2onnx to convert XGBClassifier inside a Pipeline"""
+    import xgboost as xgb
+    from skl2onnx import update_registered_converter
+    from skl2onnx.common.shape_calculator import calculate_linear_classifier_output_shapes
+    from onnxmltools.convert.xgboost.operator_converters.XGBoost import convert_xgboost
+
+    update_registered_converter(
+        xgb.XGBClassifier,
+        'XGBoostXGBClassifier',
+        calculate_linear_classifier_output_shapes,
+        convert_xgboost,
+        options={'nocl': [True, False], 'zipmap': [True, False, 'columns']}
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description='Export a pickled retention model to ONNX')
+    parser.add_argument('model_path', help='joblib/pickle file with "model" and "scaler" keys')
+    parser.add_argument('output_path', help='Where to write the .onnx file')
+    args = parser.parse_args()
+
+    import joblib
+
+    logging.basicConfig(level=logging.INFO)
+    model_data = joblib.load(args.model_path)
+    export_onnx(model_data['model'], model_data['scaler'], args.output_path)
+    max_diff = verify_parity(model_data['model'], model_data['scaler'], args.output_path)
+    logger.info(f"Parity check passed (max probability difference {max_diff:.2e})")
+
+if __name__ == "__main__":
+    main()
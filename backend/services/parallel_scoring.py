@@ -0,0 +1,112 @@
+"""
+Company-wide scoring across a process pool with a shared-memory feature matrix
+
+The parent builds the (n, 34) feature matrix and the rule-input matrix once
+and places them side by side in one multiprocessing.shared_memory block.
+Workers load the model once in their initializer, attach to the block and
+score disjoint row ranges, so only (start, stop) pairs travel to them - never
+per-row payloads. Output is identical to MLPredictor.batch_predict.
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import settings
+from services.feature_extractor import FEATURE_NAMES
+from services.ml_predictor import MLPredictor
+from services.onnx_backend import OnnxRetentionModel
+
+logger = logging.getLogger(__name__)
+
+# Per-process state set up by _init_worker
+_worker_predictor: Optional[MLPredictor] = None
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_matrix: Optional[np.ndarray] = None
+
+def parallel_batch_predict(predictor: MLPredictor, employees_data: List[Dict],
+                           workers: Optional[int] = None,
+                           features: Optional[np.ndarray] = None) -> List[Tuple[float, Dict]]:
+    """Score many employees across SCORING_WORKERS processes
+
+    features, when given, is the (n, 34) matrix to score (e.g. from the
+    feature store) instead of one extracted from employees_data.
+    """
+    workers = workers or settings.SCORING_WORKERS or os.cpu_count() or 1
+    extractor = predictor.feature_extractor
+    if workers <= 1 or len(employees_data) < settings.PARALLEL_SCORING_MIN_ROWS:
+        if features is None:
+            return predictor.batch_predict(employees_data)
+        return predictor.score_matrix(features, extractor.extract_rule_inputs(employees_data))
+
+    if features is None:
+        features, _ = extractor.extract_batch(employees_data, dtype=np.float64)
+    rule_inputs = extractor.extract_rule_inputs(employees_data)
+    n_rows = len(employees_data)
+    shape = (n_rows, features.shape[1] + rule_inputs.shape[1])
+
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * np.dtype(np.float64).itemsize)
+    try:
+        matrix = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        matrix[:, :features.shape[1]] = features
+        matrix[:, features.shape[1]:] = rule_inputs
+        del features, rule_inputs
+
+        ranges = _row_ranges(n_rows, workers)
+        context = multiprocessing.get_context('spawn')  # fork is unsafe after OpenMP/threads start
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(shm.name, shape, _model_spec(predictor))
+        ) as pool:
+            predictions = []
+            for chunk in pool.map(_score_range, ranges):
+                predictions.extend(chunk)
+        del matrix
+    finally:
+        shm.close()
+        shm.unlink()
+
+    logger.info(f"Scored {n_rows} employees across {workers} worker processes")
+    return predictions
+
+def _row_ranges(n_rows: int, workers: int) -> List[Tuple[int, int]]:
+    """Split rows into a few ranges per worker so slow ranges don't idle the pool"""
+    n_ranges = min(n_rows, workers * 4)
+    bounds = np.linspace(0, n_rows, n_ranges + 1, dtype=int)
+    return [(int(start), int(stop)) for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+
+def _model_spec(predictor: MLPredictor) -> Dict:
+    """What a worker needs to rebuild the parent's model (pickled once per worker)"""
+    if predictor.model is None:
+        return {'version': predictor.model_version}
+    if isinstance(predictor.model, OnnxRetentionModel):
+        # onnxruntime sessions can't be pickled; reload the same registry version
+        return {'version': predictor.model_version, 'registry_version': predictor.model_version}
+    return {'version': predictor.model_version, 'model': predictor.model, 'scaler': predictor.scaler}
+
+def _init_worker(shm_name: str, shape: Tuple[int, int], model_spec: Dict):
+    global _worker_predictor, _worker_shm, _worker_matrix
+
+    predictor = MLPredictor()
+    if 'registry_version' in model_spec:
+        predictor.load_version(model_spec['registry_version'])
+    elif 'model' in model_spec:
+        predictor._set_model(model_spec['model'], model_spec['scaler'], model_spec['version'])
+    _worker_predictor = predictor
+
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_matrix = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+
+def _score_range(row_range: Tuple[int, int]) -> List[Tuple[float, Dict]]:
+    start, stop = row_range
+    n_features = len(FEATURE_NAMES)
+    features = _worker_matrix[start:stop, :n_features]
+    rule_inputs = _worker_matrix[start:stop, n_features:]
+    return _worker_predictor.score_matrix(features, rule_inputs)
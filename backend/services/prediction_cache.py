@@ -0,0 +1,118 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set
+
+import numpy as np
+
+from config import settings
+
+class PredictionCache:
+    """Bounded in-memory cache of prediction results
+
+    Keys are a hash of the extracted feature vector (and, for predictions,
+    the rule inputs, which tell a missing metric from a zero) plus the model
+    version, so a changed metric or a swapped model can never return a stale
+    result. Entries are evicted least-recently-used once max_size is reached
+    and expire after ttl_seconds. Values are copied in and out, so callers
+    may mutate what they get back. Safe to share between threadpool workers.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.max_size = settings.PREDICTION_CACHE_SIZE if max_size is None else max_size
+        self.ttl_seconds = settings.PREDICTION_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, value, employee_ids)
+        # Employees with identical inputs share a key, so both sides are sets
+        self._employee_keys: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(features: np.ndarray, model_version: Optional[str], rule_inputs=None) -> str:
+        """Hash a single feature vector (and rule-input row) together with the model version"""
+        digest = hashlib.blake2b(np.ascontiguousarray(features, dtype=np.float64).tobytes(), digest_size=16)
+        if rule_inputs is not None:
+            digest.update(np.asarray(rule_inputs, dtype=np.float64).tobytes())
+        digest = digest.hexdigest()
+        return f"{model_version}:{digest}"
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return copy.deepcopy(value)
+
+    def put(self, key: str, value: Any, employee_id: Optional[str] = None):
+        if self.max_size <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            employee_ids = set()
+            if key in self._entries:
+                employee_ids = self._entries[key][2]
+            if employee_id is not None:
+                # An employee only ever has one live entry: their latest inputs
+                keys = self._employee_keys.setdefault(employee_id, set())
+                for previous_key in keys - {key}:
+                    keys.discard(previous_key)
+                    previous_ids = self._entries[previous_key][2]
+                    previous_ids.discard(employee_id)
+                    if not previous_ids:
+                        self._remove(previous_key)
+                keys.add(key)
+                employee_ids.add(employee_id)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value, employee_ids)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate_employee(self, employee_id: str):
+        """Drop the cached prediction for an employee whose metrics changed"""
+        with self._lock:
+            for key in list(self._employee_keys.get(employee_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        """Drop every entry, e.g. after a model swap"""
+        with self._lock:
+            self._entries.clear()
+            self._employee_keys.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def _remove(self, key: str):
+        """Remove an entry and its employee index; caller holds the lock"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            for employee_id in entry[2]:
+                keys = self._employee_keys.get(employee_id)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._employee_keys[employee_id]
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import time
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from fastapi import Request
+from starlette.concurrency import run_in_threadpool
+
+from config import settings
+from models.employee import Employee
+from services.ml_predictor import MLPredictor
+from services.prediction_cache import PredictionCache
+from services.micro_batcher import MicroBatcher
+
+logger = logging.getLogger(__name__)
+
+WARMUP_BATCH_SIZE = 64
+
+class PredictorService:
+    """Process-wide owner of the loaded MLPredictor
+
+    Created once in the app lifespan and shared by every route through the
+    get_predictor_service dependency. Model loading and inference run in the
+    threadpool so a slow prediction never blocks the event loop.
+
+    New registry versions are loaded into a separate MLPredictor, warmed up,
+    and then swapped in with a single attribute assignment. Requests already
+    running keep the predictor they started with, so a reload never fails or
+    stalls in-flight predictions.
+
+    Single predictions go through a shared PredictionCache, which is cleared
+    whenever a new model is swapped in. With MICRO_BATCH_ENABLED, concurrent
+    single predictions are coalesced by a MicroBatcher into one batch call.
+
+    The initial load (or training) can run as a background task via
+    start_loading(); until it finishes the service holds an empty predictor,
+    so predictions are served by the rule-based fallback.
+    """
+
+    def __init__(self):
+        self.cache = PredictionCache()
+        self.predictor = MLPredictor()
+        self.predictor.cache = self.cache
+        self.batcher = MicroBatcher(self._predict_micro_batch) if settings.MICRO_BATCH_ENABLED else None
+        self._reload_lock = asyncio.Lock()
+        self._watcher_task: Optional[asyncio.Task] = None
+        self._load_task: Optional[asyncio.Task] = None
+        self.status = 'not_loaded'  # not_loaded -> loading -> ready | failed
+        self.phase: Optional[str] = None
+        self.error: Optional[str] = None
+        self._load_started: Optional[float] = None
+        self._load_finished: Optional[float] = None
+
+    @property
+    def model_version(self) -> Optional[str]:
+        return self.predictor.model_version
+
+    @property
+    def is_ready(self) -> bool:
+        return self.status == 'ready'
+
+    async def load(self) -> bool:
+        """Load (or train) the model off the event loop, then swap it in"""
+        self.status = 'loading'
+        self.error = None
+        self._load_started = time.monotonic()
+        try:
+            candidate = MLPredictor()
+            loaded = await run_in_threadpool(candidate.load_model, self._set_phase)
+            self._swap(candidate)
+            self.status = 'ready'
+            logger.info(f"Predictor ready (model version: {self.model_version})")
+            return loaded
+        except Exception as e:
+            self.status = 'failed'
+            self.error = str(e)
+            logger.error(f"Model load failed, serving rule-based predictions: {e}")
+            return False
+        finally:
+            self.phase = None
+            self._load_finished = time.monotonic()
+
+    def start_loading(self):
+        """Load the model in a background task, then start the registry watcher"""
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self._load_then_watch())
+
+    async def _load_then_watch(self):
+        await self.load()
+        self.start_watcher()
+
+    def _set_phase(self, phase: str):
+        """Progress callback for MLPredictor.load_model (called from the threadpool)"""
+        self.phase = phase
+
+    def progress(self) -> Dict:
+        """Load state for the /ready endpoint"""
+        elapsed = None
+        if self._load_started is not None:
+            elapsed = (self._load_finished or time.monotonic()) - self._load_started
+        return {
+            'status': self.status,
+            'phase': self.phase,
+            'model_version': self.model_version,
+            'rule_based': self.predictor.model is None,
+            'elapsed_seconds': elapsed,
+            'error': self.error
+        }
+
+    async def predict(self, employee_data: Dict) -> Tuple[float, Dict]:
+        """Predict retention risk for a single employee"""
+        if self.batcher is not None:
+            return await self.batcher.submit(employee_data)
+        predictor = self.predictor
+        return await run_in_threadpool(predictor.predict, employee_data)
+
+    async def batch_predict(self, employees_data: List[Dict]) -> List[Tuple[float, Dict]]:
+        """Predict retention risk for many employees in one vectorized pass"""
+        predictor = self.predictor
+        return await run_in_threadpool(predictor.batch_predict, employees_data)
+
+    def _predict_micro_batch(self, employees_data: List[Dict]) -> List[Tuple[float, Dict]]:
+        """Score one coalesced batch of interactive requests (runs in the threadpool)"""
+        return self.predictor.batch_predict(employees_data, use_cache=True)
+
+    async def reload(self, version: Optional[str] = None) -> Dict:
+        """Load a registry version in the background, warm it up and swap it in"""
+        async with self._reload_lock:
+            previous_version = self.model_version
+            candidate = MLPredictor()
+            await run_in_threadpool(candidate.load_version, version)
+            await run_in_threadpool(self._warm_up, candidate)
+
+            self._swap(candidate)
+            logger.info(f"Swapped model {previous_version} -> {candidate.model_version}")
+            return {'previous_version': previous_version, 'model_version': candidate.model_version}
+
+    def _swap(self, candidate: MLPredictor):
+        """Start serving from a loaded predictor; in-flight requests keep the old one"""
+        candidate.cache = self.cache
+        self.predictor = candidate
+        self.cache.clear()
+
+    def invalidate_employee(self, employee_id: str):
+        """Forget the cached prediction for an employee whose inputs changed"""
+        self.cache.invalidate_employee(employee_id)
+
+    def _warm_up(self, predictor: MLPredictor):
+        """Run a test batch through a freshly loaded predictor before it serves traffic"""
+        predictions = predictor.batch_predict([{}] * WARMUP_BATCH_SIZE)
+        probabilities = np.array([probability for probability, _ in predictions], dtype=np.float64)
+        served_by = {details['model_version'] for _, details in predictions}
+        if not np.all(np.isfinite(probabilities)) or served_by != {predictor.model_version}:
+            raise ValueError(f"Model version {predictor.model_version} failed warm-up")
+
+    def start_watcher(self, interval: Optional[int] = None):
+        """Poll the registry manifest and reload when the active version changes"""
+        interval = settings.MODEL_REGISTRY_POLL_SECONDS if interval is None else interval
+        if interval > 0 and self._watcher_task is None:
+            self._watcher_task = asyncio.create_task(self._watch_registry(interval))
+
+    async def shutdown(self):
+        """Cancel the background load (if still running) and the registry watcher"""
+        if self._load_task is not None and not self._load_task.done():
+            self._load_task.cancel()
+            try:
+                await self._load_task
+            except asyncio.CancelledError:
+                pass
+        await self.stop_watcher()
+
+    async def stop_watcher(self):
+        if self._watcher_task is not None:
+            self._watcher_task.cancel()
+            try:
+                await self._watcher_task
+            except asyncio.CancelledError:
+                pass
+            self._watcher_task = None
+
+    async def _watch_registry(self, interval: int):
+        registry = self.predictor.registry
+        last_mtime = registry.manifest_mtime()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                mtime = registry.manifest_mtime()
+                if mtime == last_mtime:
+                    continue
+                last_mtime = mtime
+                active_version = await run_in_threadpool(registry.active_version)
+                if active_version and active_version != self.model_version:
+                    await self.reload(active_version)
+            except Exception as e:
+                logger.error(f"Model registry watcher failed to reload: {e}")
+
+def build_employee_payload(employee: Employee) -> Dict:
+    """Build predictor input from the HRIS fields stored on an Employee row"""
+    tenure_days = 0
+    if employee.hire_date:
+        hire_date = employee.hire_date
+        if isinstance(hire_date, datetime):
+            hire_date = hire_date.date()
+        tenure_days = (date.today() - hire_date).days
+
+    return {
+        'employee_id': employee.employee_id,
+        'basic_info': {
+            'department': employee.department or '',
+            'position': employee.position or '',
+            'tenure_days': tenure_days
+        }
+    }
+
+def build_scoring_payload(employee: Employee, collector=None) -> Dict:
+    """HRIS payload plus any integration metrics from a DataCollector-like collector"""
+    payload = build_employee_payload(employee)
+    if collector is not None:
+        collected = collector.collect_employee_data(employee)
+        payload.update({key: value for key, value in collected.items() if key.endswith('_metrics')})
+    return payload
+
+def get_predictor_service(request: Request) -> PredictorService:
+    """FastAPI dependency returning the predictor created at startup"""
+    return request.app.state.predictor_service
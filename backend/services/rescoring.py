@@ -0,0 +1,200 @@
+"""
+Incremental rescoring: only re-predict employees whose inputs changed
+
+Every employee stores an input fingerprint covering their HRIS fields, the
+integration metrics fed to the model and the model version that scored them.
+A rescore recomputes fingerprints, runs the vectorized batch path over the
+dirty set only, and writes scores and Prediction rows in bulk. With a
+FeatureStore, employees are scored on their stored vectors, the same vectors
+training reads, when one was built from their current inputs; anyone whose
+inputs changed since the snapshot is re-extracted. Run the snapshot first.
+
+Run the nightly jobs from the backend directory with:
+
+    python -m services.feature_store snapshot
+    python -m services.rescoring [--force]
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.employee import Employee
+from models.prediction import Prediction
+from services.explainer import drivers_to_importance
+from services.feature_extractor import FEATURE_NAMES
+from services.feature_store import FeatureStore
+from services.ml_predictor import MLPredictor
+from services.predictor_service import build_scoring_payload
+from services.parallel_scoring import parallel_batch_predict
+
+logger = logging.getLogger(__name__)
+
+# Fields on Employee that feed the model; changing any of them dirties the employee
+HRIS_FINGERPRINT_FIELDS = ['department', 'position', 'hire_date', 'is_active']
+
+# Tenure moves every day; bucketing it means an otherwise unchanged employee
+# is refreshed about once a month instead of every night
+TENURE_BUCKET_DAYS = 30
+
+def compute_input_fingerprint(employee: Employee, employee_data: Dict, model_version: Optional[str]) -> str:
+    """Stable hash of everything a prediction for this employee depends on"""
+    inputs = {
+        'hris': {field: getattr(employee, field) for field in HRIS_FINGERPRINT_FIELDS},
+        'tenure_bucket': employee_data.get('basic_info', {}).get('tenure_days', 0) // TENURE_BUCKET_DAYS,
+        'metrics': {key: value for key, value in employee_data.items() if key.endswith('_metrics')},
+        'model_version': model_version
+    }
+    encoded = json.dumps(inputs, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+def mark_dirty(db: Session, employee_ids: List[str]):
+    """Flag employees for the next incremental rescore"""
+    if employee_ids:
+        db.query(Employee).filter(Employee.employee_id.in_(employee_ids)).update(
+            {Employee.needs_rescore: True}, synchronize_session=False
+        )
+
+class IncrementalRescorer:
+    """Re-predict only employees whose fingerprint changed since they were last scored"""
+
+    def __init__(self, db: Session, predictor: MLPredictor, collector=None,
+                 feature_store: Optional[FeatureStore] = None):
+        self.db = db
+        self.predictor = predictor
+        # Optional DataCollector-like object supplying integration metrics
+        self.collector = collector
+        # Optional FeatureStore whose fresh vectors are scored instead of re-extracting them
+        self.feature_store = feature_store
+
+    def build_payload(self, employee: Employee) -> Dict:
+        """HRIS payload plus any integration metrics from the collector"""
+        return build_scoring_payload(employee, self.collector)
+
+    def run(self, company_id: Optional[str] = None, force: bool = False) -> Dict:
+        """Rescore the dirty set and persist the results in bulk"""
+        started = datetime.now()
+        model_version = self.predictor.model_version
+
+        query = self.db.query(Employee).filter(Employee.is_active == True)
+        if company_id:
+            query = query.filter(Employee.company_id == company_id)
+        employees = query.all()
+
+        dirty = []
+        for employee in employees:
+            payload = self.build_payload(employee)
+            fingerprint = compute_input_fingerprint(employee, payload, model_version)
+            if force or employee.needs_rescore or employee.input_fingerprint != fingerprint:
+                dirty.append((employee, payload, fingerprint))
+
+        if dirty:
+            payloads = [payload for _, payload, _ in dirty]
+            features = self._features(dirty, payloads)
+            predictions = parallel_batch_predict(self.predictor, payloads, features=features)
+            # Stored with each Prediction so outcomes can later be trained on
+            self._write_results(dirty, predictions, features.tolist(), started)
+
+        summary = {
+            'total_employees': len(employees),
+            'rescored': len(dirty),
+            'skipped': len(employees) - len(dirty),
+            'model_version': model_version,
+            'duration_seconds': (datetime.now() - started).total_seconds()
+        }
+        logger.info(f"Incremental rescore: {summary}")
+        return summary
+
+    def _features(self, dirty: List, payloads: List[Dict]) -> np.ndarray:
+        """Feature-store vectors built from the current inputs, extracted from the payloads otherwise
+
+        A stored vector that predates a change to the employee's inputs would
+        score the old inputs (and disagree with the rules, which read the
+        payload), so its input fingerprint must match the current one.
+        """
+        extractor = self.predictor.feature_extractor
+        if self.feature_store is None:
+            return extractor.extract_batch(payloads, dtype=np.float64)[0]
+
+        employee_ids = [employee.employee_id for employee, _, _ in dirty]
+        stored = self.feature_store.latest(employee_ids)
+        stored_fingerprints = stored['input_fingerprint'].to_dict()
+        found = np.array([stored_fingerprints.get(employee.employee_id)
+                          == compute_input_fingerprint(employee, payload, None)
+                          for (employee, _, _), payload in zip(dirty, payloads)], dtype=bool)
+        features = np.empty((len(employee_ids), len(FEATURE_NAMES)), dtype=np.float64)
+        if found.any():
+            features[found] = stored.loc[[employee_ids[i] for i in np.flatnonzero(found)], FEATURE_NAMES].to_numpy()
+        if not found.all():
+            features[~found] = extractor.extract_batch([payloads[i] for i in np.flatnonzero(~found)],
+                                                       dtype=np.float64)[0]
+        logger.info(f"Feature store supplied {int(found.sum())} of {len(employee_ids)} feature vectors")
+        return features
+
+    def _write_results(self, dirty: List, predictions: List, feature_vectors: List[List[float]],
+                       scored_at: datetime):
+        employee_updates = []
+        prediction_rows = []
+        for (employee, _, fingerprint), (risk_score, details), feature_vector in zip(dirty, predictions,
+                                                                                     feature_vectors):
+            risk_score = float(risk_score)
+            risk_factors = list(details['risk_factors'].keys())
+            employee_updates.append({
+                'id': employee.id,
+                'current_risk_score': risk_score,
+                'risk_factors': risk_factors,
+                'last_prediction_date': scored_at,
+                'input_fingerprint': fingerprint,
+                'needs_rescore': False
+            })
+            prediction_rows.append({
+                'employee_id': employee.employee_id,
+                'prediction_date': scored_at,
+                'risk_score': risk_score,
+                'confidence_score': float(details['confidence']),
+                'prediction_horizon_days': settings.WARNING_PERIOD_DAYS,
+                'risk_factors': risk_factors,
+                'recommendations': details['suggested_interventions'],
+                'model_version': details['model_version'],
+                'feature_importance': drivers_to_importance(details['drivers']),
+                'feature_vector': feature_vector
+            })
+
+        try:
+            self.db.bulk_update_mappings(Employee, employee_updates)
+            self.db.bulk_insert_mappings(Prediction, prediction_rows)
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+def main():
+    parser = argparse.ArgumentParser(description='Rescore employees whose inputs changed')
+    parser.add_argument('--company-id', help='Only rescore one company')
+    parser.add_argument('--force', action='store_true', help='Rescore every active employee')
+    args = parser.parse_args()
+
+    from app import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    predictor = MLPredictor()
+    predictor.load_model()
+    db = SessionLocal()
+    try:
+        from services.data_collector import DataCollector
+
+        # Same inputs as /predictions/batch, so both produce the same fingerprints
+        rescorer = IncrementalRescorer(db, predictor, DataCollector(db), FeatureStore())
+        rescorer.run(company_id=args.company_id, force=args.force)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
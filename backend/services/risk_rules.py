@@ -0,0 +1,176 @@
+"""
+Declarative risk-factor, fallback and intervention rules
+
+Each rule is a row in a table and is evaluated as a boolean mask over a
+whole batch of rule inputs (FeatureExtractor.extract_rule_inputs). Rows are
+summarised as a bitmask of fired rules, so the risk-factor dict and the
+intervention list are built once per distinct combination rather than once
+per employee. Intervention templates are interned and pre-sorted by priority
+at import time; the dicts returned are shared and must be treated as read-only.
+"""
+
+import operator
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from services.feature_extractor import RULE_INPUT_SOURCES
+
+RULE_INPUT_INDEX = {field: j for j, (_, field) in enumerate(RULE_INPUT_SOURCES)}
+
+# Work on numpy columns (boolean masks) and on single Python values alike
+OPERATORS = {'<': operator.lt, '>': operator.gt, '==': operator.eq}
+
+# (factor, level, input field, operator, threshold, skip if this factor already fired)
+RISK_FACTOR_RULES = [
+    ('declining_communication', 'high', 'participation_trend', '==', 1.0, None),
+    ('low_engagement', 'medium', 'message_count', '<', 10, 'declining_communication'),
+    ('negative_sentiment', 'high', 'sentiment_score', '<', -0.1, None),
+    ('burnout_risk', 'high', 'after_hours_messages', '>', 25, None),
+    ('meeting_avoidance', 'medium', 'meetings_declined', '>', 20, None),
+    ('performance_decline', 'high', 'performance_trend', '==', 1.0, None),
+    ('workload_imbalance', 'high', 'workload_balance', '<', 0.3, None),
+]
+
+# Used when no model is loaded: (factor, level, input field, operator, threshold, score weight)
+FALLBACK_RULES = [
+    ('declining_communication', 'high', 'participation_trend', '==', 1.0, 0.3),
+    ('negative_sentiment', 'high', 'sentiment_score', '<', -0.2, 0.2),
+    ('burnout_risk', 'high', 'after_hours_messages', '>', 30, 0.2),
+    ('disengagement', 'medium', 'meetings_declined', '>', 30, 0.15),
+    ('performance_decline', 'medium', 'performance_trend', '==', 1.0, 0.15),
+]
+FALLBACK_MAX_SCORE = 0.95
+
+PRIORITY_ORDER = {'critical': 0, 'high': 1, 'medium': 2, 'low': 3}
+
+# (triggering risk factor, intervention), in the order they were historically appended
+INTERVENTION_RULES = [
+    ('declining_communication', {
+        'action': 'Schedule 1:1 Check-in',
+        'description': 'Have a direct conversation about engagement and any concerns',
+        'priority': 'high',
+        'timeline': 'within 3 days',
+        'owner': 'Direct Manager'
+    }),
+    ('burnout_risk', {
+        'action': 'Workload Review',
+        'description': 'Review current workload and consider redistribution or support',
+        'priority': 'high',
+        'timeline': 'within 1 week',
+        'owner': 'Manager + HR'
+    }),
+    ('burnout_risk', {
+        'action': 'Promote Work-Life Balance',
+        'description': 'Encourage time off and establish after-hours boundaries',
+        'priority': 'medium',
+        'timeline': 'immediate',
+        'owner': 'Manager'
+    }),
+    ('negative_sentiment', {
+        'action': 'Employee Wellness Check',
+        'description': 'HR to conduct confidential wellness conversation',
+        'priority': 'high',
+        'timeline': 'within 3 days',
+        'owner': 'HR Partner'
+    }),
+    ('performance_decline', {
+        'action': 'Performance Support Plan',
+        'description': 'Identify skill gaps and provide training/mentoring',
+        'priority': 'medium',
+        'timeline': 'within 2 weeks',
+        'owner': 'Manager'
+    }),
+    ('meeting_avoidance', {
+        'action': 'Meeting Optimization',
+        'description': 'Review meeting necessity and employee involvement',
+        'priority': 'low',
+        'timeline': 'within 2 weeks',
+        'owner': 'Manager'
+    }),
+]
+
+# Offered when the probability is high but no specific factor fired
+RETENTION_DISCUSSION = {
+    'action': 'Retention Discussion',
+    'description': 'Discuss career goals, compensation, and growth opportunities',
+    'priority': 'critical',
+    'timeline': 'immediately',
+    'owner': 'Manager + HR'
+}
+RETENTION_DISCUSSION_THRESHOLD = 0.7
+
+# Stable sort once: filtering this list keeps the same order as sorting each filtered subset
+SORTED_INTERVENTIONS = sorted(INTERVENTION_RULES, key=lambda rule: PRIORITY_ORDER[rule[1]['priority']])
+
+def _mask(rule_inputs: np.ndarray, field: str, op: str, threshold: float) -> np.ndarray:
+    return OPERATORS[op](rule_inputs[:, RULE_INPUT_INDEX[field]], threshold)
+
+def evaluate_risk_factors(rule_inputs: np.ndarray) -> np.ndarray:
+    """Bitmask per row of which RISK_FACTOR_RULES fired"""
+    codes = np.zeros(len(rule_inputs), dtype=np.int64)
+    fired = {}
+    for bit, (factor, _, field, op, threshold, unless) in enumerate(RISK_FACTOR_RULES):
+        mask = _mask(rule_inputs, field, op, threshold)
+        if unless is not None:
+            mask &= ~fired[unless]
+        fired[factor] = mask
+        codes |= mask.astype(np.int64) << bit
+    return codes
+
+def evaluate_fallback(rule_inputs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Rule-based risk scores and FALLBACK_RULES bitmasks per row"""
+    scores = np.zeros(len(rule_inputs), dtype=np.float64)
+    codes = np.zeros(len(rule_inputs), dtype=np.int64)
+    for bit, (_, _, field, op, threshold, weight) in enumerate(FALLBACK_RULES):
+        mask = _mask(rule_inputs, field, op, threshold)
+        # Same summation order as adding each weight in turn, so scores match exactly
+        scores = scores + np.where(mask, weight, 0.0)
+        codes |= mask.astype(np.int64) << bit
+    return np.minimum(scores, FALLBACK_MAX_SCORE), codes
+
+def match_risk_factors(values: Sequence[float]) -> Dict:
+    """RISK_FACTOR_RULES for a single rule-input row, without numpy overhead"""
+    risk_factors = {}
+    for factor, level, field, op, threshold, unless in RISK_FACTOR_RULES:
+        if unless is not None and unless in risk_factors:
+            continue
+        if OPERATORS[op](values[RULE_INPUT_INDEX[field]], threshold):
+            risk_factors[factor] = level
+    return risk_factors
+
+def match_fallback(values: Sequence[float]) -> Tuple[float, Dict]:
+    """FALLBACK_RULES score and risk factors for a single rule-input row"""
+    risk_score = 0.0
+    risk_factors = {}
+    for factor, level, field, op, threshold, weight in FALLBACK_RULES:
+        if OPERATORS[op](values[RULE_INPUT_INDEX[field]], threshold):
+            risk_score += weight
+            risk_factors[factor] = level
+    return min(risk_score, FALLBACK_MAX_SCORE), risk_factors
+
+def risk_factor_dicts(codes: np.ndarray, rules: List[Tuple] = RISK_FACTOR_RULES) -> List[Dict]:
+    """Expand bitmasks into {factor: level} dicts, one fresh dict per row"""
+    templates = {}
+    for code in np.unique(codes).tolist():
+        templates[code] = {rule[0]: rule[1] for bit, rule in enumerate(rules) if code >> bit & 1}
+    return [dict(templates[code]) for code in codes.tolist()]
+
+def generate_interventions(risk_factors: Dict, probability: float) -> List[Dict]:
+    """Recommended interventions for one employee's risk factors, highest priority first"""
+    interventions = [intervention for factor, intervention in SORTED_INTERVENTIONS if factor in risk_factors]
+    if probability > RETENTION_DISCUSSION_THRESHOLD and not interventions:
+        interventions.append(RETENTION_DISCUSSION)
+    return interventions
+
+def interventions_batch(codes: np.ndarray, probabilities: np.ndarray,
+                        rules: List[Tuple] = RISK_FACTOR_RULES) -> List[List[Dict]]:
+    """generate_interventions for a batch, computed once per distinct (factors, high-risk) pair"""
+    high_risk = np.asarray(probabilities, dtype=np.float64) > RETENTION_DISCUSSION_THRESHOLD
+    keys = codes * 2 + high_risk
+    lists = {}
+    for key in np.unique(keys).tolist():
+        code, is_high_risk = key >> 1, key & 1
+        factors = {rule[0] for bit, rule in enumerate(rules) if code >> bit & 1}
+        lists[key] = generate_interventions(factors, 1.0 if is_high_risk else 0.0)
+    return [list(lists[key]) for key in keys.tolist()]
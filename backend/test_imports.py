@@ -1,11 +1,15 @@
 #!/usr/bin/env python
 """
 Test script to debug import issues
-Run this to see which packages are actually available
+Run this to see which packages are actually available, and how long the
+API modules take to import cold (each in a fresh interpreter)
 """
 
 import sys
 import importlib
+import json
+import os
+import subprocess
 
 def test_import(module_name, package_name=None):
     """Test if a module can be imported"""
@@ -68,4 +72,65 @@ print(f"Python executable: {sys.executable}")
 if hasattr(sys, 'real_prefix') or (hasattr(sys, 'base_prefix') and sys.base_prefix != sys.prefix):
     print("✅ Running in a virtual environment")
 else:
-    print("⚠️  Not running in a virtual environment")
\ No newline at end of file
+    print("⚠️  Not running in a virtual environment")
+
+# Cold-import budget for the API process, in milliseconds. Workers must come
+# up fast enough to autoscale, so heavy libraries load on first use instead.
+IMPORT_BUDGET_MS = {
+    'config': 300,
+    'models': 600,
+    'services.ml_predictor': 600,
+    'api.routes': 1500,
+    'app': 2000,
+}
+
+# Must not be imported just by importing the API modules above
+LAZY_MODULES = ['xgboost', 'sklearn', 'pandas', 'joblib', 'onnxruntime',
+                'textblob', 'slack_sdk', 'googleapiclient']
+
+COLD_IMPORT_SCRIPT = """
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({'ms': elapsed_ms, 'loaded': [m for m in sys.argv[2:] if m in sys.modules]}))
+"""
+
+def cold_import(module_name):
+    """Import a module in a fresh interpreter; returns (milliseconds, eagerly loaded heavy modules)"""
+    result = subprocess.run(
+        [sys.executable, '-c', COLD_IMPORT_SCRIPT, module_name, *LAZY_MODULES],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise ImportError(result.stderr.strip().splitlines()[-1] if result.stderr else 'unknown error')
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return report['ms'], report['loaded']
+
+print()
+print("=" * 60)
+print("Cold Import Budget")
+print("=" * 60)
+print()
+
+within_budget = True
+for module_name, budget_ms in IMPORT_BUDGET_MS.items():
+    try:
+        elapsed_ms, loaded = cold_import(module_name)
+    except ImportError as e:
+        print(f"❌ {module_name}: FAILED - {e}")
+        within_budget = False
+        continue
+    ok = elapsed_ms <= budget_ms and not loaded
+    within_budget = within_budget and ok
+    note = f" (eagerly imports {', '.join(loaded)})" if loaded else ""
+    print(f"{'✅' if ok else '❌'} {module_name}: {elapsed_ms:.0f} ms / {budget_ms} ms budget{note}")
+
+print()
+if within_budget:
+    print("✅ API modules import within budget")
+else:
+    print("❌ Import budget exceeded; profile with: python -X importtime -c 'import app'")
+    sys.exit(1)
@@ -6,10 +6,15 @@ from sklearn.metrics import (
 )
 import matplotlib.pyplot as plt
 import seaborn as sns
-from typing import Tuple, Dict, List
+from typing import Tuple, Dict, Iterable, List, Optional
 import pickle
 import logging
 
+from permutation_importance import permutation_importance
+from streaming_metrics import (
+    COST_FALSE_NEGATIVE, COST_FALSE_POSITIVE, best_threshold, evaluate_chunks, threshold_sweep
+)
+
 logger = logging.getLogger(__name__)
 
 class ModelEvaluator:
@@ -42,6 +47,12 @@ class ModelEvaluator:
             'classification_report': classification_report(y_test, y_pred, output_dict=True)
         }
         
+        # Every threshold from one sort of the scores
+        sweep = threshold_sweep(y_test, y_pred_proba)
+        metrics['f1_threshold'], f1_index = best_threshold(sweep, 'f1')
+        metrics['cost_threshold'], _ = best_threshold(sweep, 'cost')
+        metrics['best_f1'] = float(sweep['f1'][f1_index])
+        
         # Log results
         logger.info(f"ROC-AUC Score: {metrics['roc_auc']:.3f}")
         logger.info(f"Average Precision: {metrics['avg_precision']:.3f}")
@@ -92,9 +103,28 @@ class ModelEvaluator:
         logger.info(f"Evaluation plots saved to {save_path}")
     
     def analyze_feature_importance(self, feature_names: List[str], 
-                                  top_n: int = 15) -> pd.DataFrame:
-        """Analyze and visualize feature importance"""
-        if hasattr(self.model, 'feature_importances_'):
+                                  top_n: int = 15, method: str = 'builtin',
+                                  X_val: Optional[pd.DataFrame] = None, y_val: Optional[pd.Series] = None,
+                                  n_repeats: int = 5, n_jobs: Optional[int] = None) -> pd.DataFrame:
+        """Analyze and visualize feature importance
+        
+        method='permutation' measures the ROC-AUC lost when each feature is
+        shuffled on (X_val, y_val), which unlike feature_importances_ is not
+        biased towards high-cardinality features.
+        """
+        if method == 'permutation':
+            if X_val is None or y_val is None:
+                raise ValueError("Permutation importance needs X_val and y_val")
+            result = permutation_importance(
+                self.model, self.scaler.transform(X_val), np.asarray(y_val),
+                n_repeats=n_repeats, n_jobs=n_jobs
+            )
+            importance_df = pd.DataFrame({
+                'feature': feature_names,
+                'importance': result['importances_mean'],
+                'importance_std': result['importances_std']
+            }).sort_values('importance', ascending=False)
+        elif hasattr(self.model, 'feature_importances_'):
             importances = self.model.feature_importances_
             
             # Create dataframe
@@ -102,34 +132,57 @@ class ModelEvaluator:
                 'feature': feature_names,
                 'importance': importances
             }).sort_values('importance', ascending=False)
-            
-            # Plot
-            plt.figure(figsize=(10, 8))
-            sns.barplot(data=importance_df.head(top_n), 
-                       x='importance', y='feature', palette='viridis')
-            plt.title(f'Top {top_n} Most Important Features')
-            plt.xlabel('Importance Score')
-            plt.tight_layout()
-            plt.show()
-            
-            return importance_df
         else:
             logger.warning("Model doesn't have feature_importances_ attribute")
             return pd.DataFrame()
+        
+        # Plot
+        plt.figure(figsize=(10, 8))
+        sns.barplot(data=importance_df.head(top_n), 
+                   x='importance', y='feature', palette='viridis')
+        plt.title(f'Top {top_n} Most Important Features')
+        plt.xlabel('Importance Score')
+        plt.tight_layout()
+        plt.show()
+        
+        return importance_df
     
-    def calculate_optimal_threshold(self, X_val: pd.DataFrame, y_val: pd.Series) -> float:
-        """Calculate optimal classification threshold"""
+    def calculate_optimal_threshold(self, X_val: pd.DataFrame, y_val: pd.Series, metric: str = 'f1',
+                                    cost_fp: float = COST_FALSE_POSITIVE,
+                                    cost_fn: float = COST_FALSE_NEGATIVE) -> float:
+        """Calculate optimal classification threshold (max F1, or min cost with metric='cost')"""
         X_val_scaled = self.scaler.transform(X_val)
         y_pred_proba = self.model.predict_proba(X_val_scaled)[:, 1]
         
-        precision, recall, thresholds = precision_recall_curve(y_val, y_pred_proba)
-        
-        # Find threshold that maximizes F1 score
-        f1_scores = 2 * (precision * recall) / (precision + recall + 1e-10)
-        optimal_idx = np.argmax(f1_scores[:-1])
-        optimal_threshold = thresholds[optimal_idx]
+        # One sort and cumulative sum gives every threshold's metrics
+        sweep = threshold_sweep(y_val, y_pred_proba, cost_fp, cost_fn)
+        optimal_threshold, optimal_idx = best_threshold(sweep, metric)
         
         logger.info(f"Optimal threshold: {optimal_threshold:.3f}")
-        logger.info(f"F1 score at optimal threshold: {f1_scores[optimal_idx]:.3f}")
+        logger.info(f"F1 score at optimal threshold: {sweep['f1'][optimal_idx]:.3f}")
+        logger.info(f"Cost at optimal threshold: {sweep['cost'][optimal_idx]:.1f}")
+        
+        return optimal_threshold
+    
+    def evaluate_streaming(self, chunks: Iterable[Tuple[pd.DataFrame, pd.Series]],
+                           cost_fp: float = COST_FALSE_POSITIVE,
+                           cost_fn: float = COST_FALSE_NEGATIVE) -> Dict:
+        """ROC-AUC, PR-AUC and best thresholds over (X, y) chunks too large to hold at once"""
+        def scored_chunks():
+            for X_chunk, y_chunk in chunks:
+                yield np.asarray(y_chunk), self.model.predict_proba(self.scaler.transform(X_chunk))[:, 1]
+        
+        metrics = evaluate_chunks(scored_chunks(), cost_fp=cost_fp, cost_fn=cost_fn)
+        logger.info(f"Streaming evaluation over {metrics['n_rows']:,} rows - "
+                    f"ROC-AUC: {metrics['roc_auc']:.3f}, PR-AUC: {metrics['pr_auc']:.3f}, "
+                    f"F1 threshold: {metrics['f1_threshold']:.3f}, cost threshold: {metrics['cost_threshold']:.3f}")
+        return metrics
+    
+    def evaluate_parquet(self, path: str, **kwargs) -> Dict:
+        """evaluate_streaming over a Parquet file or partitioned dataset written by synthetic_data.py"""
+        from out_of_core import iter_parquet_batches
+        from synthetic_data import FEATURE_NAMES, LABEL
         
-        return optimal_threshold
\ No newline at end of file
+        return self.evaluate_streaming(
+            ((batch[FEATURE_NAMES], batch[LABEL]) for batch in iter_parquet_batches(path)), **kwargs
+        )
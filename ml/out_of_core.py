@@ -0,0 +1,78 @@
+import logging
+import os
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.preprocessing import StandardScaler
+
+from synthetic_data import FEATURE_NAMES, LABEL
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 250_000
+
+def iter_parquet_batches(path: str, batch_size: int = BATCH_SIZE) -> Iterator[pd.DataFrame]:
+    """Stream a Parquet file or partitioned directory as DataFrames of at most batch_size rows"""
+    import pyarrow.dataset as ds
+
+    dataset = ds.dataset(path, format='parquet', partitioning='hive')
+    columns = [c for c in ['employee_id'] + FEATURE_NAMES + [LABEL] if c in dataset.schema.names]
+    for batch in dataset.to_batches(columns=columns, batch_size=batch_size):
+        if batch.num_rows:
+            yield batch.to_pandas()
+
+def holdout_mask(batch: pd.DataFrame, validation_fraction: float) -> np.ndarray:
+    """Stable validation membership per row, the same on every pass over the data"""
+    keys = batch[['employee_id']] if 'employee_id' in batch.columns else batch[FEATURE_NAMES]
+    return pd.util.hash_pandas_object(keys, index=False).to_numpy() % 1000 < validation_fraction * 1000
+
+def fit_streaming_scaler(path: str, validation_fraction: float = 0.1,
+                         batch_size: int = BATCH_SIZE) -> StandardScaler:
+    """StandardScaler fitted batch by batch (partial_fit) on the training rows"""
+    scaler = StandardScaler()
+    n_rows = 0
+    for batch in iter_parquet_batches(path, batch_size):
+        train = batch.loc[~holdout_mask(batch, validation_fraction), FEATURE_NAMES]
+        if len(train):
+            scaler.partial_fit(train.to_numpy(dtype=np.float64))
+            n_rows += len(train)
+    if not n_rows:
+        raise ValueError(f"No training rows found in {path}")
+    logger.info(f"Scaler fitted on {n_rows:,} streamed rows")
+    return scaler
+
+class ParquetBatchIter(xgb.DataIter):
+    """Feeds scaled Parquet batches to an external-memory DMatrix
+
+    XGBoost pages each batch to the cache_prefix on disk, so only one batch of
+    raw rows is in memory at a time. split selects the training rows or the
+    validation rows of holdout_mask.
+    """
+
+    def __init__(self, path: str, scaler: StandardScaler, cache_prefix: str, split: str = 'train',
+                 validation_fraction: float = 0.1, batch_size: int = BATCH_SIZE):
+        self.path = path
+        self.scaler = scaler
+        self.split = split
+        self.validation_fraction = validation_fraction
+        self.batch_size = batch_size
+        self._batches: Optional[Iterator[pd.DataFrame]] = None
+        super().__init__(cache_prefix=os.path.join(cache_prefix, split))
+
+    def next(self, input_data) -> int:
+        """Pass the next non-empty batch to XGBoost; 0 signals the end of a pass"""
+        if self._batches is None:
+            self._batches = iter_parquet_batches(self.path, self.batch_size)
+        for batch in self._batches:
+            in_validation = holdout_mask(batch, self.validation_fraction)
+            rows = batch[in_validation if self.split == 'validation' else ~in_validation]
+            if len(rows):
+                features = self.scaler.transform(rows[FEATURE_NAMES].to_numpy(dtype=np.float64))
+                input_data(data=features.astype(np.float32), label=rows[LABEL].to_numpy())
+                return 1
+        return 0
+
+    def reset(self):
+        self._batches = None
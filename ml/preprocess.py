@@ -1,119 +1,308 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
+from pathlib import Path
+import json
 import logging
+import warnings
 
 logger = logging.getLogger(__name__)
 
+# Declared raw schema: (column, payload section, payload field, dtype, default when absent)
+RAW_SCHEMA = [
+    ('tenure_days', 'basic_info', 'tenure_days', np.int32, 0),
+    ('department', 'basic_info', 'department', 'category', 'unknown'),
+    ('position', 'basic_info', 'position', 'category', 'unknown'),
+    ('slack_messages', 'slack_metrics', 'message_count', np.int32, 0),
+    ('slack_response_time', 'slack_metrics', 'avg_response_time', np.float32, 0),
+    ('slack_channels', 'slack_metrics', 'active_channels', np.int16, 0),
+    ('slack_sentiment', 'slack_metrics', 'sentiment_score', np.float32, 0),
+    ('slack_after_hours', 'slack_metrics', 'after_hours_messages', np.int32, 0),
+    ('slack_trend', 'slack_metrics', 'participation_trend', 'category', 'stable'),
+    ('email_sent', 'email_metrics', 'sent_count', np.int32, 0),
+    ('email_received', 'email_metrics', 'received_count', np.int32, 0),
+    ('email_response_time', 'email_metrics', 'avg_response_time', np.float32, 0),
+    ('email_unread', 'email_metrics', 'unread_percentage', np.float32, 0),
+    ('email_after_hours', 'email_metrics', 'after_hours_emails', np.int32, 0),
+    ('email_sentiment', 'email_metrics', 'email_sentiment', np.float32, 0),
+    ('email_external', 'email_metrics', 'external_communication', np.int32, 0),
+    ('meeting_hours', 'calendar_metrics', 'meeting_hours', np.float32, 0),
+    ('meetings_declined', 'calendar_metrics', 'meetings_declined', np.int16, 0),
+    ('one_on_ones', 'calendar_metrics', 'one_on_ones', np.int16, 0),
+    ('recurring_dropped', 'calendar_metrics', 'recurring_meetings_dropped', np.int16, 0),
+    ('meeting_participation', 'calendar_metrics', 'meeting_participation', np.float32, 0),
+    ('calendar_fragmentation', 'calendar_metrics', 'calendar_fragmentation', np.float32, 0),
+    ('pto_days', 'calendar_metrics', 'pto_days', np.float32, 0),  # Fractional: calendar hours / 8
+    ('task_completion', 'productivity_metrics', 'task_completion_rate', np.float32, 0),
+    ('project_involvement', 'productivity_metrics', 'project_involvement', np.int16, 0),
+    ('code_commits', 'productivity_metrics', 'code_commits', np.int32, 0),
+    ('ticket_resolution', 'productivity_metrics', 'ticket_resolution_time', np.float32, 0),
+    ('performance_trend', 'productivity_metrics', 'performance_trend', 'category', 'stable'),
+    ('skill_utilization', 'productivity_metrics', 'skill_utilization', np.float32, 0),
+    ('workload_balance', 'productivity_metrics', 'workload_balance', np.float32, 0)
+]
+
+INTEGER_COLUMNS = {column for column, _, _, dtype, _ in RAW_SCHEMA
+                   if dtype != 'category' and np.dtype(dtype).kind == 'i'}
+
+# Written next to the model artifact, e.g. models/retention_model.pkl -> models/preprocessor.json
+PREPROCESSOR_FILE = 'preprocessor.json'
+CATEGORICAL_COLUMNS = ['department', 'position']
+TREND_COLUMNS = ['slack_trend', 'performance_trend']
+
+# (risk indicator, column, quantile, comparison); each column's cutpoint is fitted once
+RISK_CUTPOINTS = [
+    ('burnout_risk', 'after_hours_total', 0.75, '>'),
+    ('burnout_risk', 'meeting_hours', 0.75, '>'),
+    ('isolation_risk', 'slack_channels', 0.25, '<'),
+    ('isolation_risk', 'one_on_ones', 0.25, '<')
+]
+
+def _checked_cast(values, dtype, column: str) -> np.ndarray:
+    """Cast to a RAW_SCHEMA dtype, raising instead of truncating fractions or wrapping out-of-range values
+
+    Integer columns with gaps (None/NaN) stay float32 until imputed.
+    """
+    array = np.asarray(values, dtype=np.float64)
+    present = array[~np.isnan(array)]
+    if np.dtype(dtype).kind == 'i':
+        info = np.iinfo(dtype)
+        if (present != np.round(present)).any():
+            raise ValueError(f"{column} has fractional values; RAW_SCHEMA declares {np.dtype(dtype)}")
+        if present.size and (present.min() < info.min or present.max() > info.max):
+            raise ValueError(f"{column} has values outside the {np.dtype(dtype)} range [{info.min}, {info.max}]")
+        if present.size < array.size:
+            return array.astype(np.float32)
+    elif present.size and np.abs(present).max() > np.finfo(dtype).max:
+        raise ValueError(f"{column} has values outside the {np.dtype(dtype)} range")
+    return array.astype(dtype)
+
 class DataPreprocessor:
-    def __init__(self):
-        self.feature_columns = []
-        
-    def preprocess_raw_data(self, raw_data: Dict) -> pd.DataFrame:
-        """Convert raw integration data to feature dataframe"""
-        features = []
-        
-        for employee_id, data in raw_data.items():
-            employee_features = self._extract_employee_features(data)
-            employee_features['employee_id'] = employee_id
-            features.append(employee_features)
+    """Raw integration data to model features, with statistics fitted once
+
+    fit() learns normalization means/stds, the risk-indicator quantile
+    cutpoints and category code maps; transform() and transform_record()
+    apply them, so a row's features never depend on the rest of its batch.
+    """
+
+    def __init__(self, stats: Optional[Dict] = None):
+        self.stats = stats
+        self.feature_columns = stats.get('feature_columns', []) if stats else []
         
-        df = pd.DataFrame(features)
-        return self._engineer_features(df)
+    def preprocess_raw_data(self, raw_data: Dict, fit: bool = False,
+                            report: Optional['MemoryReport'] = None) -> pd.DataFrame:
+        """Convert raw integration data to feature dataframe (fitting first if asked or never fitted)"""
+        report = report or MemoryReport()
+        df = self.to_frame(raw_data)
+        report.record('build', df)
+        df = self.handle_missing_values(df)
+        report.record('impute', df)
+        df = self.optimize_dtypes(df)  # Integer columns that had gaps return to their schema dtype
+        report.record('optimize', df)
+        if fit or self.stats is None:
+            self.fit(df)
+        df = self.transform(df)
+        report.record('transform', df)
+        return df
     
-    def _extract_employee_features(self, data: Dict) -> Dict:
-        """Extract features from employee data"""
-        features = {}
-        
-        # Basic features
-        basic = data.get('basic_info', {})
-        features['tenure_days'] = basic.get('tenure_days', 0)
-        features['department'] = basic.get('department', 'unknown')
-        features['position'] = basic.get('position', 'unknown')
-        
-        # Slack features
-        slack = data.get('slack_metrics', {})
-        features['slack_messages'] = slack.get('message_count', 0)
-        features['slack_response_time'] = slack.get('avg_response_time', 0)
-        features['slack_channels'] = slack.get('active_channels', 0)
-        features['slack_sentiment'] = slack.get('sentiment_score', 0)
-        features['slack_after_hours'] = slack.get('after_hours_messages', 0)
-        features['slack_trend'] = slack.get('participation_trend', 'stable')
+    def to_frame(self, raw_data: Dict) -> pd.DataFrame:
+        """One row of raw features per employee, built column by column in the RAW_SCHEMA dtypes
         
-        # Email features
-        email = data.get('email_metrics', {})
-        features['email_sent'] = email.get('sent_count', 0)
-        features['email_received'] = email.get('received_count', 0)
-        features['email_response_time'] = email.get('avg_response_time', 0)
-        features['email_unread'] = email.get('unread_percentage', 0)
-        features['email_after_hours'] = email.get('after_hours_emails', 0)
-        features['email_sentiment'] = email.get('email_sentiment', 0)
-        features['email_external'] = email.get('external_communication', 0)
-        
-        # Calendar features
-        calendar = data.get('calendar_metrics', {})
-        features['meeting_hours'] = calendar.get('meeting_hours', 0)
-        features['meetings_declined'] = calendar.get('meetings_declined', 0)
-        features['one_on_ones'] = calendar.get('one_on_ones', 0)
-        features['recurring_dropped'] = calendar.get('recurring_meetings_dropped', 0)
-        features['meeting_participation'] = calendar.get('meeting_participation', 0)
-        features['calendar_fragmentation'] = calendar.get('calendar_fragmentation', 0)
-        features['pto_days'] = calendar.get('pto_days', 0)
-        
-        # Productivity features
-        productivity = data.get('productivity_metrics', {})
-        features['task_completion'] = productivity.get('task_completion_rate', 0)
-        features['project_involvement'] = productivity.get('project_involvement', 0)
-        features['code_commits'] = productivity.get('code_commits', 0)
-        features['ticket_resolution'] = productivity.get('ticket_resolution_time', 0)
-        features['performance_trend'] = productivity.get('performance_trend', 'stable')
-        features['skill_utilization'] = productivity.get('skill_utilization', 0)
-        features['workload_balance'] = productivity.get('workload_balance', 0)
-        
-        return features
+        Absent fields take the schema default; explicit None values are left
+        missing (NaN) for handle_missing_values. Strings become categoricals.
+        """
+        records = list(raw_data.values())
+        columns = {}
+        for column, section, field, dtype, default in RAW_SCHEMA:
+            values = [record.get(section, {}).get(field, default) for record in records]
+            if dtype == 'category':
+                columns[column] = pd.Categorical(values)
+                continue
+            columns[column] = _checked_cast(values, dtype, column)
+        columns['employee_id'] = pd.array(list(raw_data.keys()), dtype='string')
+        return pd.DataFrame(columns)
+    
+    def fit(self, df: pd.DataFrame) -> 'DataPreprocessor':
+        """Learn normalization, quantile, category and imputation statistics from a training frame"""
+        numeric = df.select_dtypes(include=[np.number])
+        means, stds = numeric.astype(np.float64).mean(), numeric.astype(np.float64).std()
+        derived = self._interactions(df)
+        self.stats = {
+            'normalize': {col: {'mean': float(means[col]), 'std': float(stds[col])}
+                          for col in numeric.columns if stds[col] > 0},
+            # Sorted codes, as pd.Categorical assigns them; unseen categories map to -1
+            'categories': {col: {value: code for code, value in enumerate(sorted(df[col].dropna().unique()))}
+                           for col in CATEGORICAL_COLUMNS},
+            'cutpoints': {col: float((derived[col] if col in derived else df[col]).quantile(q))
+                          for _, col, q, _ in RISK_CUTPOINTS},
+            # Medians and modes that fill gaps at inference time
+            'impute': {**{col: float(numeric[col].median()) for col in numeric.columns},
+                       **{col: self._mode(df[col]) for col in CATEGORICAL_COLUMNS + TREND_COLUMNS
+                          if col in df.columns}},
+            'fitted_rows': len(df)
+        }
+        self.feature_columns = self.stats['feature_columns'] = list(self.transform(df.head(1)).columns)
+        return self
+    
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.fit(df).transform(df)
     
-    def _engineer_features(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Engineer additional features"""
+    def transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Engineer features for any number of rows with the fitted statistics"""
+        if self.stats is None:
+            raise RuntimeError("DataPreprocessor must be fit() or load()ed before transform()")
+        
         # Normalize numeric features
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
-        for col in numeric_columns:
-            if df[col].std() > 0:
-                df[f'{col}_normalized'] = (df[col] - df[col].mean()) / df[col].std()
+        new_columns = {
+            f'{col}_normalized': ((df[col] - params['mean']) / params['std']).astype(np.float32)
+            for col, params in self.stats['normalize'].items()
+        }
         
         # Encode categorical features
-        df['department_encoded'] = pd.Categorical(df['department']).codes
-        df['position_encoded'] = pd.Categorical(df['position']).codes
+        for col, codes in self.stats['categories'].items():
+            new_columns[f'{col}_encoded'] = self._encode(df[col], codes)
         
         # Create interaction features
-        df['communication_balance'] = abs(df['slack_messages'] - df['email_sent'])
-        df['after_hours_total'] = df['slack_after_hours'] + df['email_after_hours']
-        df['sentiment_average'] = (df['slack_sentiment'] + df['email_sentiment']) / 2
-        df['engagement_score'] = (df['meeting_participation'] + df['task_completion']) / 2
+        new_columns.update(self._interactions(df))
         
         # Create risk indicators
-        df['burnout_risk'] = (
-            (df['after_hours_total'] > df['after_hours_total'].quantile(0.75)).astype(int) +
-            (df['meeting_hours'] > df['meeting_hours'].quantile(0.75)).astype(int)
-        ) / 2
+        columns = {**df, **new_columns}
+        cutpoints = self.stats['cutpoints']
+        for risk in ('burnout_risk', 'isolation_risk'):
+            flags = [(columns[col] > cutpoints[col]) if op == '>' else (columns[col] < cutpoints[col])
+                     for name, col, _, op in RISK_CUTPOINTS if name == risk]
+            new_columns[risk] = (sum(flag.astype(np.int8) for flag in flags) / len(flags)).astype(np.float32)
         
-        df['isolation_risk'] = (
-            (df['slack_channels'] < df['slack_channels'].quantile(0.25)).astype(int) +
-            (df['one_on_ones'] < df['one_on_ones'].quantile(0.25)).astype(int)
-        ) / 2
+        return pd.concat([df, pd.DataFrame(new_columns, index=df.index)], axis=1)
+    
+    def transform_record(self, features: Dict) -> Dict:
+        """transform() for a single row of raw features, in constant time"""
+        if self.stats is None:
+            raise RuntimeError("DataPreprocessor must be fit() or load()ed before transform_record()")
         
-        return df
+        record = dict(features)
+        for col, params in self.stats['normalize'].items():
+            record[f'{col}_normalized'] = (features[col] - params['mean']) / params['std']
+        for col, codes in self.stats['categories'].items():
+            record[f'{col}_encoded'] = codes.get(features[col], -1)
+        record.update(self._interactions(features))
+        
+        cutpoints = self.stats['cutpoints']
+        for risk in ('burnout_risk', 'isolation_risk'):
+            flags = [(record[col] > cutpoints[col]) if op == '>' else (record[col] < cutpoints[col])
+                     for name, col, _, op in RISK_CUTPOINTS if name == risk]
+            record[risk] = sum(int(flag) for flag in flags) / len(flags)
+        return record
+    
+    def save(self, model_path: str) -> Path:
+        """Persist the fitted statistics next to a model artifact"""
+        path = self.stats_path(model_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(self.stats, f, indent=2)
+        logger.info(f"Preprocessor statistics saved to {path}")
+        return path
+    
+    @classmethod
+    def load(cls, model_path: str) -> 'DataPreprocessor':
+        """Preprocessor with the statistics saved next to a model artifact"""
+        with open(cls.stats_path(model_path)) as f:
+            return cls(stats=json.load(f))
+    
+    @staticmethod
+    def stats_path(model_path: str) -> Path:
+        return Path(model_path).with_name(PREPROCESSOR_FILE)
+    
+    @staticmethod
+    def _interactions(data) -> Dict:
+        """Interaction features; works on a DataFrame or a single record"""
+        return {
+            'communication_balance': abs(data['slack_messages'] - data['email_sent']),
+            'after_hours_total': data['slack_after_hours'] + data['email_after_hours'],
+            'sentiment_average': (data['slack_sentiment'] + data['email_sentiment']) / 2,
+            'engagement_score': (data['meeting_participation'] + data['task_completion']) / 2
+        }
+    
+    def _extract_employee_features(self, data: Dict) -> Dict:
+        """Extract features from employee data"""
+        return {
+            column: data.get(section, {}).get(field, default)
+            for column, section, field, _, default in RAW_SCHEMA
+        }
     
     def handle_missing_values(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Handle missing values in the dataset"""
-        # Numeric columns: fill with median
-        numeric_columns = df.select_dtypes(include=[np.number]).columns
-        for col in numeric_columns:
-            df[col].fillna(df[col].median(), inplace=True)
+        """Handle missing values in the dataset
         
-        # Categorical columns: fill with mode
-        categorical_columns = df.select_dtypes(include=['object']).columns
-        for col in categorical_columns:
-            df[col].fillna(df[col].mode()[0] if not df[col].mode().empty else 'unknown', inplace=True)
+        Numeric columns get their median and categorical/object columns their
+        mode (the fitted values once fit() has run), filled in one vectorized
+        pass over the numeric block instead of a copy per column.
+        """
+        fitted = (self.stats or {}).get('impute', {})
+        numeric_columns = list(df.select_dtypes(include=[np.number]).columns)
+        result = df.copy(deep=False)
         
-        return df
\ No newline at end of file
+        if numeric_columns:
+            block = df[numeric_columns].to_numpy(dtype=np.float64, copy=True)
+            missing = np.isnan(block)
+            if missing.any():
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN columns
+                    medians = np.nanmedian(block, axis=0)
+                medians = np.array([fitted.get(col, median) for col, median in zip(numeric_columns, medians)])
+                # Integer columns take a whole-number fill so they can return to their schema dtype
+                medians = np.where([col in INTEGER_COLUMNS for col in numeric_columns], np.round(medians), medians)
+                rows, cols = np.nonzero(missing)
+                block[rows, cols] = medians[cols]
+                for j, col in enumerate(numeric_columns):
+                    if missing[:, j].any():
+                        result[col] = block[:, j].astype(df[col].dtype)
+        
+        for col in df.select_dtypes(include=['object', 'category']).columns:
+            if df[col].isna().any():
+                fill = fitted.get(col, self._mode(df[col]))
+                if isinstance(df[col].dtype, pd.CategoricalDtype) and fill not in df[col].cat.categories:
+                    result[col] = df[col].cat.add_categories([fill]).fillna(fill)
+                else:
+                    result[col] = df[col].fillna(fill)
+        
+        return result
+    
+    def optimize_dtypes(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Cast RAW_SCHEMA columns to their declared dtypes (e.g. a frame read from CSV)"""
+        casts = {}
+        for column, _, _, dtype, _ in RAW_SCHEMA:
+            if column not in df.columns:
+                continue
+            if dtype == 'category':
+                casts[column] = df[column].astype('category')
+            else:
+                casts[column] = _checked_cast(df[column].to_numpy(), dtype, column)
+        return df.assign(**casts)
+    
+    @staticmethod
+    def _encode(series: pd.Series, codes: Dict) -> pd.Series:
+        """Fitted category codes as int16 (-1 when unseen), mapping each distinct value once"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            lookup = np.array([codes.get(value, -1) for value in series.cat.categories] + [-1], dtype=np.int16)
+            return pd.Series(lookup[series.cat.codes.to_numpy()], index=series.index)  # Code -1 (NaN) hits the trailing -1
+        return series.map(codes).fillna(-1).astype(np.int16)
+    
+    @staticmethod
+    def _mode(series: pd.Series):
+        counts = series.value_counts()
+        return counts.index[0] if len(counts) else 'unknown'
+
+class MemoryReport:
+    """Frame memory after each pipeline stage"""
+    
+    def __init__(self):
+        self.stages = []
+    
+    def record(self, stage: str, df: pd.DataFrame):
+        memory_mb = df.memory_usage(deep=True).sum() / 1024 ** 2
+        self.stages.append({'stage': stage, 'rows': len(df), 'columns': df.shape[1], 'memory_mb': memory_mb})
+        logger.info(f"{stage}: {len(df):,} rows x {df.shape[1]} columns, {memory_mb:,.1f} MB")
+    
+    def peak_mb(self) -> float:
+        return max((stage['memory_mb'] for stage in self.stages), default=0.0)
@@ -0,0 +1,194 @@
+import argparse
+import logging
+import time
+from datetime import date
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Same order and names as FeatureExtractor in the backend
+FEATURE_NAMES = [
+    'tenure_years', 'department', 'position_level',
+    'slack_messages', 'slack_response_time', 'slack_channels',
+    'slack_sentiment', 'slack_after_hours', 'slack_trend',
+    'email_sent', 'email_received', 'email_response_time',
+    'email_unread', 'email_after_hours', 'email_sentiment',
+    'email_external', 'meeting_hours', 'meetings_declined',
+    'one_on_ones', 'recurring_dropped', 'meeting_participation',
+    'calendar_fragmentation', 'pto_days', 'task_completion',
+    'project_involvement', 'code_commits', 'ticket_resolution',
+    'performance_trend', 'skill_utilization', 'workload_balance',
+    'comm_balance', 'engagement', 'burnout_risk', 'isolation'
+]
+LABEL = 'will_leave'
+
+# Uniform ranges for continuous features, on the scale FeatureExtractor produces
+UNIFORM_RANGES = {
+    'tenure_years': (0.5, 10), 'slack_messages': (0, 5), 'slack_response_time': (0, 2),
+    'slack_channels': (0, 1), 'slack_sentiment': (-0.5, 1), 'slack_after_hours': (0, 0.5),
+    'email_sent': (0, 3), 'email_received': (0, 3), 'email_response_time': (0, 2),
+    'email_unread': (0, 0.3), 'email_after_hours': (0, 0.4), 'email_sentiment': (-0.5, 1),
+    'email_external': (0, 0.5), 'meeting_hours': (0, 1.5), 'meetings_declined': (0, 0.4),
+    'one_on_ones': (0, 1), 'recurring_dropped': (0, 3), 'meeting_participation': (0.3, 1),
+    'calendar_fragmentation': (0, 1), 'pto_days': (0, 1), 'task_completion': (0.5, 1),
+    'project_involvement': (0, 1), 'code_commits': (0, 1), 'ticket_resolution': (0, 2),
+    'skill_utilization': (0.3, 1), 'workload_balance': (0.2, 1), 'comm_balance': (0, 1),
+    'engagement': (0, 1), 'burnout_risk': (0, 1), 'isolation': (0, 1)
+}
+TREND_FEATURES = ['slack_trend', 'performance_trend']
+
+# Encoded values and the HRIS labels they decode to, so Employee rows match the features
+DEPARTMENTS = {0.1: 'Engineering', 0.2: 'Product', 0.3: 'Sales', 0.4: 'Marketing',
+               0.5: 'HR', 0.6: 'Finance', 0.7: 'Operations', 0.8: 'Support'}
+POSITION_LEVELS = {0.3: 'Junior Associate', 0.5: 'Associate', 0.8: 'Senior Associate', 0.9: 'Manager'}
+
+# Employee CSV columns, in the backend's upload template order (department_name is
+# written as 'department'; inside a chunk that name is taken by the encoded feature)
+EMPLOYEE_COLUMNS = ['employee_id', 'email', 'name', 'department_name', 'position', 'manager_id', 'hire_date']
+
+class SyntheticDataGenerator:
+    """Seedable, vectorized generator of labelled 34-feature rows
+
+    Rows are produced chunk_size at a time from a per-chunk RNG seeded with
+    (seed, chunk index), so a given seed and chunk size always yield the same
+    dataset and datasets far larger than memory can be streamed to disk.
+    """
+
+    def __init__(self, seed: int = 42, chunk_size: int = 500_000, dtype=np.float32):
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.dtype = dtype
+
+    def iter_chunks(self, n_rows: int, with_employees: bool = False,
+                    as_of: Optional[date] = None) -> Iterator[pd.DataFrame]:
+        """Yield DataFrames of employee_id, the 34 features and the label
+
+        With with_employees, each chunk also carries the matching Employee
+        columns (name, email, department, position, manager_id, hire_date).
+        """
+        for chunk_index, start in enumerate(range(0, n_rows, self.chunk_size)):
+            size = min(self.chunk_size, n_rows - start)
+            rng = np.random.default_rng([self.seed, chunk_index])
+            chunk = self._features(rng, size)
+            chunk[LABEL] = self._labels(rng, chunk)
+            numbers = pd.Series(np.arange(start + 1, start + size + 1)).astype(str)
+            chunk.insert(0, 'employee_id', 'SYN' + numbers.str.zfill(8))
+            if with_employees:
+                chunk = pd.concat([chunk, self._employees(rng, chunk, numbers, as_of or date.today())], axis=1)
+            yield chunk
+
+    def generate(self, n_rows: int, with_employees: bool = False) -> pd.DataFrame:
+        """Whole dataset in memory; use write() for anything large"""
+        return pd.concat(list(self.iter_chunks(n_rows, with_employees)), ignore_index=True)
+
+    def write(self, n_rows: int, path: str, employees_path: Optional[str] = None) -> Path:
+        """Stream n_rows to Parquet or CSV (by extension), optionally with an Employee CSV
+
+        A path without an extension is written as a partitioned Parquet
+        dataset: a directory with one part file per chunk.
+        """
+        path = Path(path)
+        partitioned = path.suffix == ''
+        (path if partitioned else path.parent).mkdir(parents=True, exist_ok=True)
+        parquet_writer = None
+        started = time.perf_counter()
+        try:
+            for i, chunk in enumerate(self.iter_chunks(n_rows, with_employees=employees_path is not None)):
+                if employees_path is not None:
+                    self._append_csv(chunk[EMPLOYEE_COLUMNS], Path(employees_path), first=i == 0)
+                    chunk = chunk.drop(columns=[c for c in EMPLOYEE_COLUMNS if c != 'employee_id'])
+
+                if partitioned or path.suffix == '.parquet':
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if partitioned:
+                        pq.write_table(table, path / f'part-{i:05d}.parquet')
+                    else:
+                        if parquet_writer is None:
+                            parquet_writer = pq.ParquetWriter(path, table.schema)
+                        parquet_writer.write_table(table)  # One row group per chunk
+                else:
+                    self._append_csv(chunk, path, first=i == 0)
+                logger.info(f"Wrote {min((i + 1) * self.chunk_size, n_rows):,}/{n_rows:,} rows")
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+
+        logger.info(f"Generated {n_rows:,} rows in {time.perf_counter() - started:.1f}s -> {path}")
+        return path
+
+    def _features(self, rng: np.random.Generator, size: int) -> pd.DataFrame:
+        columns = {}
+        for name in FEATURE_NAMES:
+            if name == 'department':
+                values = rng.choice(list(DEPARTMENTS), size)
+            elif name == 'position_level':
+                values = rng.choice(list(POSITION_LEVELS), size)
+            elif name in TREND_FEATURES:
+                values = rng.integers(-1, 2, size)
+            else:
+                low, high = UNIFORM_RANGES[name]
+                values = rng.uniform(low, high, size)
+            columns[name] = values.astype(self.dtype)
+        return pd.DataFrame(columns)
+
+    def _labels(self, rng: np.random.Generator, df: pd.DataFrame) -> np.ndarray:
+        """Departure label from a noisy weighted sum of risk indicators"""
+        risk_score = (
+            (df['slack_sentiment'].to_numpy() < 0.3) * 0.2 +
+            (df['slack_trend'].to_numpy() == -1) * 0.15 +
+            (df['burnout_risk'].to_numpy() > 0.7) * 0.2 +
+            (df['meetings_declined'].to_numpy() > 0.3) * 0.1 +
+            (df['one_on_ones'].to_numpy() < 0.3) * 0.1 +
+            (df['task_completion'].to_numpy() < 0.7) * 0.15 +
+            (df['isolation'].to_numpy() > 0.7) * 0.1 +
+            rng.uniform(-0.1, 0.1, len(df))  # Add noise
+        )
+        return (risk_score > 0.5).astype(np.int8)
+
+    def _employees(self, rng: np.random.Generator, chunk: pd.DataFrame, numbers: pd.Series,
+                   as_of: date) -> pd.DataFrame:
+        """Employee columns consistent with the chunk's department, position and tenure features"""
+        # Encoded values are float32 in the chunk; round in float64 to hit the dict keys
+        departments = chunk['department'].astype(np.float64).round(1).map(DEPARTMENTS)
+        positions = chunk['position_level'].astype(np.float64).round(1).map(POSITION_LEVELS)
+        tenure_days = np.round(chunk['tenure_years'].to_numpy().astype(np.float64) * 365).astype('timedelta64[D]')
+        managers = pd.Series(rng.integers(1, max(len(chunk) // 10, 1) + 1, len(chunk))).astype(str)
+        return pd.DataFrame({
+            'email': 'employee' + numbers + '@synthetic.example',
+            'name': 'Synthetic Employee ' + numbers,
+            'department_name': departments,
+            'position': positions,
+            'manager_id': 'SYN' + managers.str.zfill(8),
+            'hire_date': np.datetime64(as_of, 'D') - tenure_days
+        })
+
+    @staticmethod
+    def _append_csv(df: pd.DataFrame, path: Path, first: bool):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if 'department_name' in df.columns:
+            df = df.rename(columns={'department_name': 'department'})
+        df.to_csv(path, mode='w' if first else 'a', header=first, index=False)
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic retention training dataset')
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--output', default='data/training_data.parquet',
+                        help='.parquet, .csv, or a directory for a partitioned Parquet dataset')
+    parser.add_argument('--employees', help='Also write matching Employee rows to this CSV')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--chunk-size', type=int, default=500_000)
+    args = parser.parse_args()
+
+    generator = SyntheticDataGenerator(seed=args.seed, chunk_size=args.chunk_size)
+    generator.write(args.rows, args.output, employees_path=args.employees)
+
+if __name__ == "__main__":
+    main()